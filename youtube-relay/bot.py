@@ -2,33 +2,139 @@
 
 import json
 import os
+import queue
 import time
 import socket
+import string
+import sys
+import threading
 import requests
-from collections import defaultdict
-from datetime import datetime, timezone
+from collections import OrderedDict, deque
+from watchfiles import watch
 
+from common import DATA_DIR, log
+from emoji_converter import EmojiConverter
+from twitch_bot import BLACKLIST_FILENAME, TwitchBot
+from youtube_reader import YouTubeChatReader
 
-def log(msg=""):
-    """Print with timestamp and immediate flush for Docker log visibility."""
-    now = datetime.now(timezone.utc)
-    ts = now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z"
-    print(f"[{ts}] {msg}", flush=True)
+# Monotonic clock for all internal durations (immune to wall-clock jumps)
+_now = time.monotonic
 
 
 # Spam protection defaults
 RATE_LIMIT_WINDOW = 30  # seconds
 RATE_LIMIT_MAX_MESSAGES = 3  # max messages per user per window
 DUPLICATE_WINDOW = 30  # seconds — block identical messages from same user
+SPAM_STATE_MAX_AUTHORS = 10_000  # least recently seen authors are evicted past this
+
+TWITCH_MAX_MESSAGE_LENGTH = 500
+
+# Twitch chat send limit (non-moderator bots: 20 messages per 30 seconds)
+TWITCH_SEND_LIMIT_MESSAGES = 20
+TWITCH_SEND_LIMIT_WINDOW = 30  # seconds
+SEND_QUEUE_MAX = 256  # outgoing messages buffered for the sender thread
+BATCH_SEPARATOR = " | "  # joins queued messages sent together in one chat message
+
+# Errors that trigger a Twitch reconnect in the relay loop
+_CONNECTION_ERRORS = (requests.exceptions.RequestException, socket.error, OSError)
+
+# Stream status watching
+STATUS_WATCH_TIMEOUT_MS = 60000  # fallback tick when no file events arrive
+STATUS_POLL_INTERVAL = 10  # seconds between polls if the file watcher fails
+OFFLINE_HEARTBEAT_INTERVAL = 600  # seconds between "still waiting" logs
+HOUSEKEEPING_INTERVAL = 60  # seconds between spam cleanup / reload checks
+
+
+def _compile_message_format(template):
+    """Pre-parse a MESSAGE_FORMAT template into a format_message(author, message) callable.
+
+    Templates using only plain {author}/{message} fields are rewritten once
+    into a %-style template, so formatting is a single C-level % per message.
+    Anything fancier (format specs, conversions, other fields) falls back to
+    str.format.
+    """
+    def format_with_str_format(author, message):
+        return template.format(author=author, message=message)
+
+    field_index = {"author": 0, "message": 1}
+    percent_parts = []
+    indices = []
+    try:
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            percent_parts.append(literal.replace("%", "%%"))
+            if field is None:
+                continue
+            if field not in field_index or spec or conversion:
+                return format_with_str_format
+            percent_parts.append("%s")
+            indices.append(field_index[field])
+    except ValueError:
+        return format_with_str_format
+
+    percent_template = "".join(percent_parts)
+    indices = tuple(indices)
+
+    if indices == (0, 1):
+        # Default-style template: {author} then {message}
+        def format_message(author, message):
+            return percent_template % (author, message)
+    else:
+        def format_message(author, message):
+            values = (author, message)
+            return percent_template % tuple([values[i] for i in indices])
+
+    return format_message
+
+
+class TokenBucket:
+    """Token bucket pacer: allows bursts up to `capacity`, refilling at `refill_rate`/s."""
+
+    def __init__(self, capacity, refill_rate):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = float(capacity)
+        self._last = _now()
+
+    def _refill(self):
+        now = _now()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.refill_rate)
+        self._last = now
+
+    def wait_time(self):
+        """Seconds until a token is available (0 if one is available now), without taking it."""
+        self._refill()
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.refill_rate
+
+    def acquire(self):
+        """Take one token. Returns seconds to wait before using it (0 if available now).
+
+        The token is reserved even when the caller has to wait, so callers
+        just sleep for the returned time and proceed.
+        """
+        self._refill()
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.refill_rate
+
+
+class _SpamEntry:
+    """Per-author spam tracking state (recent send times + last message)."""
+
+    __slots__ = ("timestamps", "last_hash", "last_time")
+
+    def __init__(self):
+        self.timestamps = deque(maxlen=RATE_LIMIT_MAX_MESSAGES)
+        self.last_hash = None
+        self.last_time = 0.0
 
 
 class YouTubeToTwitchBot:
     """Coordinates YouTube chat reading and Twitch message sending."""
 
     def __init__(self, config):
-        from youtube_reader import YouTubeChatReader
-        from twitch_bot import TwitchBot
-
         self.youtube = YouTubeChatReader(config["youtube_channel_url"])
 
         self.twitch = TwitchBot(
@@ -44,85 +150,91 @@ class YouTubeToTwitchBot:
 
         self.twitch_channel_name = config.get("twitch_channel_name", "")
         self.message_format = config.get("message_format", "[YT] {author}: {message}")
+        self._format_message = _compile_message_format(self.message_format)
         self.debug_mode = config.get("debug_mode", False)
         self.auto_restart = config.get("auto_restart", True)
         self.restart_delay = config.get("restart_delay", 30)
         self.blocked_terms_refresh_minutes = config.get("blocked_terms_refresh_minutes", 30)
         self.running = False
-
-        from emoji_converter import EmojiConverter
-        # ../data for local dev, ./data for Docker (/app/data)
-        data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
-        if not os.path.isdir(data_dir):
-            data_dir = os.path.join(os.path.dirname(__file__), "data")
+        self._stop_event = threading.Event()
+        self._is_live = False
+        self._status_changed = threading.Event()
+        self._blacklist_changed = threading.Event()
+        self._status_thread = None
+        self._status_cache = (None, False)  # ((st_ino, st_mtime_ns), is_live)
+
+        self._status_path = os.path.join(DATA_DIR, "stream-status.json")
         self.emoji_converter = EmojiConverter(
-            data_dir,
+            DATA_DIR,
             reload_interval=300,
         )
         self.emoji_converter.reload()
 
-        # Spam protection state — keyed by author name
-        # _user_timestamps: { "Author": [timestamp, timestamp, ...] }
-        # _user_last_message: { "Author": ("message text", timestamp) }
-        self._user_timestamps = defaultdict(list)
-        self._user_last_message = {}
+        # Outgoing messages are sent (and paced) by a background thread so
+        # Twitch API latency doesn't hold up reading YouTube chat
+        self._send_queue = queue.Queue(maxsize=SEND_QUEUE_MAX)
+        self._send_bucket = TokenBucket(
+            TWITCH_SEND_LIMIT_MESSAGES,
+            TWITCH_SEND_LIMIT_MESSAGES / TWITCH_SEND_LIMIT_WINDOW,
+        )
+        self._sender_thread = None
+
+        # Spam protection state — one _SpamEntry per interned author name,
+        # in least-recently-seen order so raids can't grow it unbounded
+        self._spam_state = OrderedDict()
 
-    def _is_rate_limited(self, author):
-        """Check if a user has exceeded the message rate limit.
+    def _check_spam(self, author, message, now):
+        """Run the duplicate and rate limit checks for one message.
 
-        Returns True if the user sent more than RATE_LIMIT_MAX_MESSAGES
-        in the last RATE_LIMIT_WINDOW seconds.
+        Returns "duplicate" if the user sent the exact same message within
+        DUPLICATE_WINDOW seconds, "rate_limited" if the user already sent
+        RATE_LIMIT_MAX_MESSAGES in the last RATE_LIMIT_WINDOW seconds,
+        otherwise None. `now` is the caller's monotonic timestamp.
         """
-        now = time.time()
+        message_hash = hash(message)
+        spam_state = self._spam_state
+        entry = spam_state.get(author)
+        if entry is None:
+            entry = spam_state[author] = _SpamEntry()
+            if len(spam_state) > SPAM_STATE_MAX_AUTHORS:
+                spam_state.popitem(last=False)
+        else:
+            spam_state.move_to_end(author)
+
+        # Duplicate check
+        if entry.last_hash == message_hash and (now - entry.last_time) < DUPLICATE_WINDOW:
+            return "duplicate"
+        entry.last_hash = message_hash
+        entry.last_time = now
+
+        # Rate limit check — prune old timestamps (oldest first)
+        timestamps = entry.timestamps
         cutoff = now - RATE_LIMIT_WINDOW
-
-        # Prune old timestamps
-        timestamps = [t for t in self._user_timestamps[author] if t > cutoff]
-        self._user_timestamps[author] = timestamps
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
 
         if len(timestamps) >= RATE_LIMIT_MAX_MESSAGES:
-            return True
+            return "rate_limited"
 
-        self._user_timestamps[author].append(now)
-        return False
+        timestamps.append(now)
+        return None
 
-    def _is_duplicate(self, author, message):
-        """Check if this is a duplicate message from the same user.
+    def _cleanup_spam_state(self, now):
+        """Periodically clean up stale entries from the spam tracking dict.
 
-        Returns True if the user sent the exact same message within
-        DUPLICATE_WINDOW seconds.
+        _spam_state is kept in least-recently-seen order, so stale authors
+        sit at the front; stop at the first one that is still active.
         """
-        now = time.time()
-        last = self._user_last_message.get(author)
-
-        if last:
-            last_msg, last_time = last
-            if last_msg == message and (now - last_time) < DUPLICATE_WINDOW:
-                return True
-
-        self._user_last_message[author] = (message, now)
-        return False
-
-    def _cleanup_spam_state(self):
-        """Periodically clean up stale entries from spam tracking dicts."""
-        now = time.time()
         cutoff = now - RATE_LIMIT_WINDOW
+        spam_state = self._spam_state
 
-        # Clean up timestamps
-        stale_users = [
-            user for user, timestamps in self._user_timestamps.items()
-            if not timestamps or timestamps[-1] < cutoff
-        ]
-        for user in stale_users:
-            del self._user_timestamps[user]
-
-        # Clean up last messages
-        stale_msgs = [
-            user for user, (_, ts) in self._user_last_message.items()
-            if (now - ts) > DUPLICATE_WINDOW
-        ]
-        for user in stale_msgs:
-            del self._user_last_message[user]
+        while spam_state:
+            entry = next(iter(spam_state.values()))
+            if entry.timestamps and entry.timestamps[-1] >= cutoff:
+                break
+            if (now - entry.last_time) <= DUPLICATE_WINDOW:
+                break
+            spam_state.popitem(last=False)
 
     def _read_stream_status(self):
         """Read live status from shared data/stream-status.json (written by main bot).
@@ -130,10 +242,20 @@ class YouTubeToTwitchBot:
         If TWITCH_CHANNEL_NAME is set, only checks that specific channel.
         Otherwise falls back to checking if any channel is live.
         Returns False if the file is missing or unreadable (assume offline).
+        The parsed result is cached until the file's inode or mtime changes.
         """
-        status_path = os.path.join(os.path.dirname(__file__), "..", "data", "stream-status.json")
-        if not os.path.isfile(status_path):
-            status_path = os.path.join(os.path.dirname(__file__), "data", "stream-status.json")
+        status_path = self._status_path
+
+        try:
+            st = os.stat(status_path)
+        except OSError:
+            return False
+
+        # The main bot replaces the file via rename, so a new inode also
+        # signals a change even on filesystems with coarse mtimes
+        cache_key = (st.st_ino, st.st_mtime_ns)
+        if self._status_cache[0] == cache_key:
+            return self._status_cache[1]
 
         try:
             with open(status_path, "r", encoding="utf-8") as f:
@@ -141,37 +263,160 @@ class YouTubeToTwitchBot:
         except (FileNotFoundError, json.JSONDecodeError, OSError):
             return False
 
+        is_live = False
         if self.twitch_channel_name:
             info = data.get(self.twitch_channel_name, {})
-            return isinstance(info, dict) and info.get("live") is True
+            is_live = isinstance(info, dict) and info.get("live") is True
+        else:
+            for channel_name, info in data.items():
+                if isinstance(info, dict) and info.get("live") is True:
+                    is_live = True
+                    break
+
+        self._status_cache = (cache_key, is_live)
+        return is_live
+
+    def _data_file_changes(self, filenames):
+        """Yield the set of `filenames` that changed in the data directory.
+
+        Yields an empty set at least every 60s. Uses a filesystem watcher
+        (inotify on Linux, FSEvents on macOS) so changes are seen
+        immediately instead of on a poll tick. The main bot replaces files
+        via rename, so the directory is watched rather than the files.
+        If the data directory is missing or the watcher fails (inotify
+        watch limit, data dir removed or remounted), falls back to yielding
+        every STATUS_POLL_INTERVAL seconds so callers keep re-reading the
+        files.
+        """
+        watch_dir = os.path.dirname(self._status_path)
 
-        for channel_name, info in data.items():
-            if isinstance(info, dict) and info.get("live") is True:
-                return True
-        return False
+        if not os.path.isdir(watch_dir):
+            # Nothing to watch yet — poll like a failed watcher would
+            while not self._stop_event.wait(STATUS_POLL_INTERVAL):
+                yield set()
+            return
+
+        try:
+            for changes in watch(
+                watch_dir,
+                watch_filter=lambda _change, path: os.path.basename(path) in filenames,
+                stop_event=self._stop_event,
+                rust_timeout=STATUS_WATCH_TIMEOUT_MS,
+                yield_on_timeout=True,
+            ):
+                yield {os.path.basename(path) for _change, path in changes}
+        except Exception as e:
+            log(f"File watcher failed ({e}), polling every {STATUS_POLL_INTERVAL}s")
+            yield set()
+            while not self._stop_event.wait(STATUS_POLL_INTERVAL):
+                yield set()
+
+    def _status_watch_loop(self):
+        """Background thread: keep self._is_live in sync with stream-status.json.
+
+        Also flags blacklist.json edits (when blocked terms refresh is
+        enabled) so the main loop reloads them right away.
+        """
+        filenames = {os.path.basename(self._status_path)}
+        if self.twitch._blacklist_check_interval > 0:
+            filenames.add(BLACKLIST_FILENAME)
+
+        # start() assumes live; catch a stream that is already offline or a
+        # status written while Twitch and YouTube were connecting
+        self._sync_live_status()
+
+        while not self._stop_event.is_set():
+            try:
+                for changed in self._data_file_changes(filenames):
+                    if BLACKLIST_FILENAME in changed:
+                        self._blacklist_changed.set()
+                        self.youtube.queue.put(None)
+
+                    self._sync_live_status()
+            except Exception as e:
+                log(f"Stream status watcher error: {e}")
+                # Keep the flag current even if the watcher keeps failing
+                self._sync_live_status()
+                self._stop_event.wait(STATUS_POLL_INTERVAL)
+
+    def _sync_live_status(self):
+        """Re-read stream-status.json and wake the main loop if live status changed."""
+        is_live = self._read_stream_status()
+        if is_live != self._is_live:
+            self._is_live = is_live
+            # Wake the main loop whether it is idle or waiting on chat
+            self._status_changed.set()
+            self.youtube.queue.put(None)
+
+    def _sender_loop(self):
+        """Background thread: send queued messages to Twitch, paced by the token bucket.
+
+        While the send allowance lasts, each message goes out on its own.
+        Once it is used up, the sender waits for the next token and joins
+        the messages queued by then into a single chat message (up to the
+        Twitch length limit), so a burst uses fewer sends.
+        """
+        carry = None
+        stopping = False
+        while not stopping:
+            if carry is not None:
+                message, carry = carry, None
+            else:
+                message = self._send_queue.get()
+            if message is None or self._stop_event.is_set():
+                return
+
+            wait = self._send_bucket.wait_time()
+            if wait:
+                # Out of allowance: batch whatever queues up during the wait
+                self._stop_event.wait(wait)
+                while not self._send_queue.empty():
+                    next_message = self._send_queue.get_nowait()
+                    if next_message is None:
+                        stopping = True
+                        break
+                    joined_length = len(message) + len(BATCH_SEPARATOR) + len(next_message)
+                    if joined_length > TWITCH_MAX_MESSAGE_LENGTH:
+                        carry = next_message
+                        break
+                    message += BATCH_SEPARATOR + next_message
+
+            wait = self._send_bucket.acquire()
+            if wait:
+                self._stop_event.wait(wait)
+            # Don't start a new send once shutdown has begun
+            if self._stop_event.is_set():
+                return
+
+            try:
+                self.twitch.send_message(message)
+            except Exception as e:
+                log(f"Error sending message: {e}")
 
     def wait_for_stream_start(self):
         """Wait for stream to go live by watching data/stream-status.json."""
         log("Waiting for stream to go live (watching stream-status.json)...")
 
-        check_count = 0
-        start_time = time.time()
+        start_time = _now()
+        last_heartbeat = start_time
+        filenames = {os.path.basename(self._status_path)}
         try:
-            while self.running:
-                check_count += 1
+            for _ in self._data_file_changes(filenames):
+                if not self.running:
+                    break
+
+                now = _now()
                 if self._read_stream_status():
-                    elapsed = int(time.time() - start_time)
+                    elapsed = int(now - start_time)
                     log(f"Stream is now live! (detected after {elapsed}s)")
                     return True
 
-                # Heartbeat every 60 checks (~10 min at 10s interval)
-                if check_count % 60 == 0:
-                    elapsed = int(time.time() - start_time)
-                    minutes = elapsed // 60
+                # Heartbeat every ~10 min
+                if now - last_heartbeat >= OFFLINE_HEARTBEAT_INTERVAL:
+                    last_heartbeat = now
+                    minutes = int(now - start_time) // 60
                     log(f"   Still waiting for stream to go live ({minutes}m elapsed)")
 
-                time.sleep(10)
-
         except KeyboardInterrupt:
             log("Cancelled waiting for stream")
             return False
@@ -191,6 +436,7 @@ class YouTubeToTwitchBot:
         log("=" * 60)
 
         self.running = True
+        self._stop_event.clear()
 
         # Wait for stream to go live
         if not self.debug_mode:
@@ -211,92 +457,113 @@ class YouTubeToTwitchBot:
         log(f"Starting YouTube chat reader: {self.youtube.channel_url}")
         self.youtube.start()
 
+        # Watch stream status in the background; the loop just reads the flag
+        self._is_live = True
+        self._status_thread = threading.Thread(target=self._status_watch_loop, daemon=True)
+        self._status_thread.start()
+
+        self._sender_thread = threading.Thread(target=self._sender_loop, daemon=True)
+        self._sender_thread.start()
+
         log("Bot is now running!")
 
         was_live = True
-        last_twitch_live_check = time.time()
-        last_cleanup = time.time()
+        next_housekeeping = _now() + HOUSEKEEPING_INTERVAL
         offline_since = None
+        last_offline_heartbeat = None
 
         try:
             while self.running:
                 try:
-                    # Periodically check stream status from file
-                    if time.time() - last_twitch_live_check >= 10:
-                        is_live = self._read_stream_status()
-                        last_twitch_live_check = time.time()
-
-                        if was_live and not is_live:
-                            log("Stream went offline. Pausing relay.")
-                            was_live = False
-                            offline_since = time.time()
-                            # Stop YouTube reader to avoid pointless scraping
-                            self.youtube.stop()
-                        elif not was_live and is_live:
-                            elapsed = int(time.time() - offline_since) if offline_since else 0
-                            log(f"Stream is back online! Resuming relay. (offline {elapsed}s)")
-                            was_live = True
-                            offline_since = None
-                            # Restart YouTube reader
-                            self.youtube.start()
-                        elif not was_live and offline_since:
-                            # Periodic heartbeat while offline (~10 min)
-                            elapsed = int(time.time() - offline_since)
-                            if elapsed > 0 and elapsed % 600 < 10:
-                                minutes = elapsed // 60
-                                log(f"   Still offline ({minutes}m). Waiting...")
-
-                    # Periodically refresh blocked terms
-                    self.twitch.refresh_blocked_terms_if_needed()
-
-                    # Periodically clean up spam tracking state
-                    if time.time() - last_cleanup > 60:
-                        self._cleanup_spam_state()
-                        last_cleanup = time.time()
-
-                    # If stream is offline, don't consume messages
+                    now = _now()
+                    is_live = self._is_live
+
+                    if was_live and not is_live:
+                        log("Stream went offline. Pausing relay.")
+                        was_live = False
+                        offline_since = now
+                        last_offline_heartbeat = now
+                        # Stop YouTube reader to avoid pointless scraping
+                        self.youtube.stop()
+                    elif not was_live and is_live:
+                        elapsed = int(now - offline_since) if offline_since else 0
+                        log(f"Stream is back online! Resuming relay. (offline {elapsed}s)")
+                        was_live = True
+                        offline_since = None
+                        # Restart YouTube reader
+                        self.youtube.start()
+                    elif not was_live and offline_since:
+                        # Periodic heartbeat while offline (~10 min)
+                        if now - last_offline_heartbeat >= OFFLINE_HEARTBEAT_INTERVAL:
+                            last_offline_heartbeat = now
+                            minutes = int(now - offline_since) // 60
+                            log(f"   Still offline ({minutes}m). Waiting...")
+
+                    # Blacklist edits seen by the status watcher apply at once
+                    if self._blacklist_changed.is_set():
+                        self._blacklist_changed.clear()
+                        self.twitch.reload_blocked_terms_if_changed()
+
+                    # Periodically refresh blocked terms / emoji mappings and
+                    # clean up spam state
+                    if now >= next_housekeeping:
+                        self.twitch.refresh_blocked_terms_if_needed()
+                        self.emoji_converter.reload_if_needed()
+                        self._cleanup_spam_state(now)
+                        next_housekeeping = now + HOUSEKEEPING_INTERVAL
+                    wait_time = max(next_housekeeping - now, 0)
+
+                    # If stream is offline, don't consume messages — sleep
+                    # until the status watcher reports a change
                     if not was_live:
-                        time.sleep(1)
+                        self._status_changed.wait(wait_time)
+                        self._status_changed.clear()
                         continue
 
                     # Read from YouTube chat queue
                     try:
-                        msg = self.youtube.queue.get(timeout=1)
-                    except Exception:
-                        # queue.Empty — no messages, loop continues
+                        msg = self.youtube.queue.get(timeout=wait_time)
+                    except queue.Empty:
+                        continue
+                    if msg is None:
+                        # Wake-up from the status watcher
                         continue
+                    # The wait above may have been long; re-read once for this message
+                    now = _now()
 
-                    author = msg["author"]
+                    # Interned so spam-tracking dict lookups compare by identity
+                    author = sys.intern(msg["author"])
                     message_text = msg["message"]
 
                     # Normalize ALL CAPS to sentence case
                     if message_text:
                         message_text = self.emoji_converter.normalize_caps(message_text)
-                        message_text = message_text[0].upper() + message_text[1:]
+                        # Only rebuild the string when the first letter needs it
+                        if message_text[0].islower():
+                            message_text = message_text[0].upper() + message_text[1:]
 
                     # Convert YouTube emojis
-                    self.emoji_converter.reload_if_needed()
                     message_text = self.emoji_converter.collapse_emojis(message_text)
                     message_text = self.emoji_converter.convert(message_text)
 
-                    # Spam protection: duplicate check
-                    if self._is_duplicate(author, message_text):
+                    # Spam protection: duplicate and rate limit checks
+                    spam = self._check_spam(author, message_text, now)
+                    if spam == "duplicate":
                         log(f"[DUPLICATE] {author}: {message_text}")
                         continue
-
-                    # Spam protection: rate limit check
-                    if self._is_rate_limited(author):
+                    if spam == "rate_limited":
                         log(f"[RATE LIMITED] {author}: {message_text}")
                         continue
 
-                    formatted_msg = self.message_format.format(
-                        author=author,
-                        message=message_text,
+                    # Anything past the Twitch limit is cut off after formatting
+                    # anyway; one extra char keeps the "..." marker identical
+                    formatted_msg = self._format_message(
+                        author, message_text[:TWITCH_MAX_MESSAGE_LENGTH + 1]
                     )
 
                     # Truncate if too long (Twitch limit is 500 chars)
-                    if len(formatted_msg) > 500:
-                        formatted_msg = formatted_msg[:497] + "..."
+                    if len(formatted_msg) > TWITCH_MAX_MESSAGE_LENGTH:
+                        formatted_msg = formatted_msg[:TWITCH_MAX_MESSAGE_LENGTH - 3] + "..."
 
                     # Check blocked terms
                     is_blocked, matched_term = self.twitch.is_message_blocked(formatted_msg)
@@ -304,13 +571,13 @@ class YouTubeToTwitchBot:
                         log(f"[BLOCKED] {formatted_msg}")
                         log(f"   Reason: Contains blocked term '{matched_term}'")
                     else:
-                        log(f"-> {formatted_msg}")
-                        self.twitch.send_message(formatted_msg)
-
-                    # Rate limit between messages
-                    time.sleep(0.5)
+                        try:
+                            self._send_queue.put_nowait(formatted_msg)
+                            log(f"-> {formatted_msg}")
+                        except queue.Full:
+                            log(f"[DROPPED] Send queue full: {formatted_msg}")
 
-                except (requests.exceptions.RequestException, socket.error, OSError) as e:
+                except _CONNECTION_ERRORS as e:
                     log(f"Connection error: {e}")
                     log("Attempting to reconnect in 10 seconds...")
                     time.sleep(10)
@@ -328,6 +595,17 @@ class YouTubeToTwitchBot:
             self.running = False
 
         finally:
+            self._stop_event.set()
+            try:
+                self._send_queue.put_nowait(None)
+            except queue.Full:
+                pass  # sender sees the stop event on its next message
+            if self._status_thread:
+                self._status_thread.join(timeout=5)
+            # The sender exits after at most its in-flight send (bounded by
+            # the request timeouts); wait for it so disconnect() comes last
+            if self._sender_thread:
+                self._sender_thread.join()
             self.youtube.stop()
             self.twitch.disconnect()
             log("Bot stopped.")
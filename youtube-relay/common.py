@@ -0,0 +1,36 @@
+"""Helpers shared by the relay modules."""
+
+import os
+import time
+
+
+def _resolve_data_dir():
+    """Resolve the shared data directory (../data locally, ./data in Docker)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.path.normpath(os.path.join(here, "..", "data"))
+    if not os.path.isdir(data_dir):
+        data_dir = os.path.join(here, "data")
+    return data_dir
+
+
+DATA_DIR = _resolve_data_dir()
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") — replaced as one tuple so threads
+# never see a mismatched pair
+_log_stamp = (None, "")
+
+
+def log(msg=""):
+    """Print with timestamp (stdout is line-buffered by run.py for Docker log visibility)."""
+    global _log_stamp
+    seconds, ns = divmod(time.time_ns(), 1_000_000_000)
+    stamp_second, stamp = _log_stamp
+    if seconds != stamp_second:
+        t = time.gmtime(seconds)
+        stamp = (
+            f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}T"
+            f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+        )
+        _log_stamp = (seconds, stamp)
+    print(f"[{stamp}.{ns // 1_000_000:03d}Z] {msg}")
@@ -4,9 +4,36 @@ import os
 from dotenv import load_dotenv
 
 
+_TRUE_VALUES = frozenset(("true", "1", "yes"))
+
+
 def _parse_bool(value):
     """Parse a string to boolean."""
-    return value.lower() in ("true", "1", "yes")
+    return value.lower() in _TRUE_VALUES
+
+
+# (env var, config key, default, parser); defaults are parsed like env values.
+# A default of None marks a required setting (must be present and non-empty).
+# Auth is optional at config time — relay reads from shared data/tokens.json
+# at startup. Client secret + refresh token are kept as fallback if tokens.json
+# is unavailable (e.g. first run without main bot).
+_CONFIG_SPEC = (
+    ("YOUTUBE_CHANNEL_URL", "youtube_channel_url", None, str),
+    ("TWITCH_BOT_USER_ID", "twitch_bot_user_id", None, str),
+    ("TWITCH_OAUTH_TOKEN", "twitch_oauth_token", "", str),
+    ("TWITCH_CLIENT_ID", "twitch_client_id", None, str),
+    ("TWITCH_CLIENT_SECRET", "twitch_client_secret", "", str),
+    ("TWITCH_CHANNEL_USER_ID", "twitch_channel_user_id", None, str),
+    ("TWITCH_BROADCASTER_OAUTH_TOKEN", "twitch_broadcaster_oauth_token", "", str),
+    ("TWITCH_BOT_REFRESH_TOKEN", "twitch_bot_refresh_token", "", str),
+    ("TWITCH_BROADCASTER_REFRESH_TOKEN", "twitch_broadcaster_refresh_token", "", str),
+    ("MESSAGE_FORMAT", "message_format", "[YT] {author}: {message}", str),
+    ("TWITCH_CHANNEL_NAME", "twitch_channel_name", "", str.lower),
+    ("DEBUG_MODE", "debug_mode", "false", _parse_bool),
+    ("AUTO_RESTART", "auto_restart", "true", _parse_bool),
+    ("RESTART_DELAY", "restart_delay", "30", int),
+    ("BLOCKED_TERMS_REFRESH_MINUTES", "blocked_terms_refresh_minutes", "30", int),
+)
 
 
 def load_config():
@@ -20,43 +47,21 @@ def load_config():
         ValueError if required env vars are missing
     """
     load_dotenv()
+    env = os.environ.get
 
-    required = [
-        "YOUTUBE_CHANNEL_URL",
-        "TWITCH_BOT_USER_ID",
-        "TWITCH_CLIENT_ID",
-        "TWITCH_CHANNEL_USER_ID",
-    ]
+    config = {}
+    missing = []
+    for name, key, default, parse in _CONFIG_SPEC:
+        value = env(name, default)
+        if default is None and not value:
+            missing.append(name)
+            continue
+        config[key] = parse(value)
 
-    missing = [key for key in required if not os.environ.get(key)]
     if missing:
         raise ValueError(
             f"Missing required environment variables: {', '.join(missing)}\n"
             "Copy .env.example to .env and fill in your values."
         )
 
-    # Auth is optional at config time — relay reads from shared data/tokens.json
-    # at startup. Client secret + refresh token are kept as fallback if tokens.json
-    # is unavailable (e.g. first run without main bot).
-
-    return {
-        "youtube_channel_url": os.environ["YOUTUBE_CHANNEL_URL"],
-        "twitch_bot_user_id": os.environ["TWITCH_BOT_USER_ID"],
-        "twitch_oauth_token": os.environ.get("TWITCH_OAUTH_TOKEN", ""),
-        "twitch_client_id": os.environ["TWITCH_CLIENT_ID"],
-        "twitch_client_secret": os.environ.get("TWITCH_CLIENT_SECRET", ""),
-        "twitch_channel_user_id": os.environ["TWITCH_CHANNEL_USER_ID"],
-        "twitch_broadcaster_oauth_token": os.environ.get("TWITCH_BROADCASTER_OAUTH_TOKEN", ""),
-        "twitch_bot_refresh_token": os.environ.get("TWITCH_BOT_REFRESH_TOKEN", ""),
-        "twitch_broadcaster_refresh_token": os.environ.get(
-            "TWITCH_BROADCASTER_REFRESH_TOKEN", ""
-        ),
-        "message_format": os.environ.get("MESSAGE_FORMAT", "[YT] {author}: {message}"),
-        "twitch_channel_name": os.environ.get("TWITCH_CHANNEL_NAME", "").lower(),
-        "debug_mode": _parse_bool(os.environ.get("DEBUG_MODE", "false")),
-        "auto_restart": _parse_bool(os.environ.get("AUTO_RESTART", "true")),
-        "restart_delay": int(os.environ.get("RESTART_DELAY", "30")),
-        "blocked_terms_refresh_minutes": int(
-            os.environ.get("BLOCKED_TERMS_REFRESH_MINUTES", "30")
-        ),
-    }
+    return config
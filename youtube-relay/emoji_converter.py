@@ -1,9 +1,25 @@
 """Emoji converter for YouTube to Twitch chat relay."""
 
+import functools
 import json
 import os
 import re
 import time
+from collections import Counter
+
+
+# YouTube emoji shortcode, e.g. :heart:
+_EMOJI_RE = re.compile(r":[a-zA-Z0-9_-]+:")
+# Emoji jammed against text (needs a space before it), or a run of spaces
+_SPACING_RE = re.compile(r"(?<=\S)(:[a-zA-Z0-9_-]+:)| {2,}")
+# Converted messages remembered per mapping generation
+_CONVERT_CACHE_SIZE = 4096
+
+
+def _fix_spacing(match):
+    """re.sub callback for _SPACING_RE."""
+    emoji = match.group(1)
+    return " " + emoji if emoji else " "
 
 
 class EmojiConverter:
@@ -15,27 +31,47 @@ class EmojiConverter:
 
     def __init__(self, data_dir, reload_interval=300):
         self._data_dir = data_dir
-        self._file_path = os.path.join(data_dir, "emoji-mappings.json")
+        self._file_path = os.path.normpath(os.path.join(data_dir, "emoji-mappings.json"))
         self._mappings = {}
-        self._last_reload = 0
+        self._mapping_source = None
+        self._convert_cached = None
+        self._file_key = None  # (st_ino, st_mtime_ns) of the loaded file
+        self._last_reload = None  # monotonic time of the last load
         self._reload_interval = reload_interval
-        self._pattern = re.compile(r":[a-zA-Z0-9_-]+:")
 
     def reload(self):
-        """Reload mappings from the JSON file."""
+        """Reload mappings from the JSON file.
+
+        Skips the parse (and the convert cache reset it would trigger) when the
+        file's inode and mtime are unchanged since the last load.
+        """
+        try:
+            st = os.stat(self._file_path)
+            file_key = (st.st_ino, st.st_mtime_ns)
+        except OSError:
+            file_key = None
+        if file_key is not None and file_key == self._file_key:
+            self._last_reload = time.monotonic()
+            return
+
         try:
             with open(self._file_path, "r", encoding="utf-8") as f:
                 self._mappings = json.load(f)
-            self._last_reload = time.time()
+            self._file_key = file_key
+            self._last_reload = time.monotonic()
         except FileNotFoundError:
             self._mappings = {}
-            self._last_reload = time.time()
+            self._file_key = None
+            self._last_reload = time.monotonic()
         except (json.JSONDecodeError, OSError) as e:
             print(f"Warning: Failed to load emoji mappings: {e}")
 
     def reload_if_needed(self):
         """Reload mappings if the interval has elapsed."""
-        if time.time() - self._last_reload >= self._reload_interval:
+        if (
+            self._last_reload is None
+            or time.monotonic() - self._last_reload >= self._reload_interval
+        ):
             self.reload()
 
     def normalize_caps(self, message):
@@ -46,7 +82,12 @@ class EmojiConverter:
         is lowercased. Emoji shortcodes are unaffected since they
         are already lowercase.
         """
-        text_only = self._pattern.sub("", message)
+        # Shortcodes need a colon; skip the regex for the common no-emoji case
+        text_only = _EMOJI_RE.sub("", message) if ":" in message else message
+        # str.isupper() is False whenever any cased char is lowercase (or there
+        # are none), which rejects ordinary messages in a single C call
+        if not text_only.isupper():
+            return message
         alpha_chars = [c for c in text_only if c.isalpha()]
         if len(alpha_chars) >= 2 and all(c.isupper() for c in alpha_chars):
             return message.lower()
@@ -60,36 +101,34 @@ class EmojiConverter:
         - At most `max_unique` unique emojis are kept; extras are stripped.
         - Extra whitespace left by removals is cleaned up.
         """
-        all_emojis = self._pattern.findall(message)
-        if not all_emojis:
+        if ":" not in message:
             return message
 
-        # Count occurrences of each emoji
-        counts = {}
-        for emoji in all_emojis:
-            counts[emoji] = counts.get(emoji, 0) + 1
+        # Single regex pass: keep the matches, count from them, then rebuild
+        matches = list(_EMOJI_RE.finditer(message))
+        if not matches:
+            return message
 
-        seen = {}
-        unique_order = []
+        counts = Counter([match.group(0) for match in matches])
+        seen = set()
+        pieces = []
+        last_end = 0
 
-        def replace_match(match):
+        for match in matches:
             emoji = match.group(0)
-            if emoji not in seen:
-                if len(unique_order) >= max_unique:
-                    return ""
-                unique_order.append(emoji)
-                seen[emoji] = True
-                count = counts[emoji]
-                if count > 1:
-                    return f"{emoji} x{count} "
-                return emoji
-            else:
-                return ""
-
-        result = self._pattern.sub(replace_match, message)
+            pieces.append(message[last_end:match.start()])
+            last_end = match.end()
+            if emoji in seen or len(seen) >= max_unique:
+                continue
+            seen.add(emoji)
+            count = counts[emoji]
+            pieces.append(f"{emoji} x{count} " if count > 1 else emoji)
+        pieces.append(message[last_end:])
+
+        result = "".join(pieces)
         # Ensure a space before emojis jammed against text (e.g. "Mom:heart:")
-        result = re.sub(r"(?<=\S)(:[a-zA-Z0-9_-]+:)", r" \1", result)
-        result = re.sub(r"  +", " ", result).strip()
+        # and collapse runs of spaces left by removals, in one pass
+        result = _SPACING_RE.sub(_fix_spacing, result).strip()
         return result
 
     def convert(self, message):
@@ -97,13 +136,35 @@ class EmojiConverter:
 
         Unmapped emojis pass through as-is.
         """
-        if not self._mappings:
+        if not self._mappings or ":" not in message:
             return message
 
+        if self._mapping_source is not self._mappings:
+            self._reset_convert_cache()
+        return self._convert_cached(message)
+
+    def _convert_uncached(self, message):
+        """Replace whole :shortcode: tokens that have a mapping (see convert).
+
+        Tokenizing with _EMOJI_RE (rather than matching the mapped keys
+        directly) keeps a mapped name from matching across the closing
+        colon of an unmapped shortcode, e.g. 'a:b:heart:' stays as-is.
+        """
+        mappings = self._mappings
+
         def replace_match(match):
             emoji = match.group(0)
-            if emoji in self._mappings:
-                return self._mappings[emoji]
-            return emoji
+            return mappings.get(emoji, emoji)
+
+        return _EMOJI_RE.sub(replace_match, message)
 
-        return self._pattern.sub(replace_match, message)
+    def _reset_convert_cache(self):
+        """Start a new result cache for the current mappings dict.
+
+        Called whenever the mappings dict is replaced (e.g. by reload).
+        """
+        self._mapping_source = self._mappings
+        # Chat repeats itself a lot; cache results per mapping generation
+        self._convert_cached = functools.lru_cache(maxsize=_CONVERT_CACHE_SIZE)(
+            self._convert_uncached
+        )
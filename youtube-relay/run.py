@@ -20,6 +20,10 @@ except ImportError:
 
 
 if __name__ == "__main__":
+    # Flush each log line as it is written (Docker log visibility) without
+    # forcing an explicit flush on every print
+    sys.stdout.reconfigure(line_buffering=True)
+
     try:
         config = load_config()
     except ValueError as e:
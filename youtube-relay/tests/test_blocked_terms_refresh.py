@@ -3,7 +3,7 @@ from unittest.mock import patch, MagicMock
 
 
 def test_refresh_blocked_terms_updates_when_file_changed():
-    """refresh_blocked_terms_if_needed reloads when file mtime has changed."""
+    """refresh_blocked_terms_if_needed reloads when the file stamp has changed."""
     from twitch_bot import TwitchBot
 
     bot = TwitchBot(
@@ -15,9 +15,9 @@ def test_refresh_blocked_terms_updates_when_file_changed():
     bot.blocked_terms = ["old_term"]
     bot._last_blacklist_check = time.time() - 1900  # 31+ minutes ago
     bot._blacklist_check_interval = 1800  # 30 minutes
-    bot._blacklist_mtime = 1000  # Old mtime
+    bot._blacklist_stamp = (1, 1000)  # Old stamp
 
-    with patch("twitch_bot.os.path.getmtime", return_value=2000):  # New mtime
+    with patch("twitch_bot._file_stamp", return_value=(1, 2000)):  # New stamp
         with patch.object(bot, "fetch_blocked_terms") as mock_fetch:
             bot.refresh_blocked_terms_if_needed()
             mock_fetch.assert_called_once()
@@ -60,7 +60,7 @@ def test_refresh_blocked_terms_disabled_when_zero():
         mock_fetch.assert_not_called()
 
 
-def test_refresh_skips_when_mtime_unchanged():
+def test_refresh_skips_when_stamp_unchanged():
     """refresh_blocked_terms_if_needed skips reload when file hasn't changed."""
     from twitch_bot import TwitchBot
 
@@ -73,9 +73,94 @@ def test_refresh_skips_when_mtime_unchanged():
     bot.blocked_terms = ["term"]
     bot._last_blacklist_check = time.time() - 1900
     bot._blacklist_check_interval = 1800
-    bot._blacklist_mtime = 1000  # Same mtime
+    bot._blacklist_stamp = (1, 1000)  # Same stamp
 
-    with patch("twitch_bot.os.path.getmtime", return_value=1000):  # Unchanged
+    with patch("twitch_bot._file_stamp", return_value=(1, 1000)):  # Unchanged
         with patch.object(bot, "fetch_blocked_terms") as mock_fetch:
             bot.refresh_blocked_terms_if_needed()
             mock_fetch.assert_not_called()
+
+
+def test_file_stamp_changes_when_file_replaced(tmp_path):
+    """_file_stamp changes when the file is replaced, and is None when missing."""
+    from twitch_bot import _file_stamp
+
+    path = tmp_path / "blacklist.json"
+    assert _file_stamp(str(path)) is None
+    path.write_text("[]")
+    stamp = _file_stamp(str(path))
+    assert _file_stamp(str(path)) == stamp
+
+    tmp = tmp_path / "blacklist.json.tmp"
+    tmp.write_text("[]")
+    tmp.replace(path)
+    assert _file_stamp(str(path)) != stamp
+
+
+def test_is_message_blocked_matches_text_and_regex(tmp_path):
+    """Text terms match case-insensitively as substrings; regex entries are searched."""
+    import json
+    from twitch_bot import TwitchBot
+
+    blacklist = tmp_path / "blacklist.json"
+    blacklist.write_text(json.dumps(["BadWord", "spam link", "/fr[e3]{2}\\s*v-?bucks/i"]))
+
+    bot = TwitchBot(
+        bot_user_id="123",
+        oauth_token="token",
+        client_id="client",
+        channel_user_id="456",
+    )
+    with patch("twitch_bot._data_path", return_value=str(blacklist)):
+        bot.fetch_blocked_terms()
+
+    assert bot.is_message_blocked("this has a BADWORD in it") == (True, "badword")
+    assert bot.is_message_blocked("click my Spam Link now") == (True, "spam link")
+    assert bot.is_message_blocked("get FREE vbucks") == (True, "fr[e3]{2}\\s*v-?bucks")
+    assert bot.is_message_blocked("perfectly fine message") == (False, None)
+
+
+def test_is_message_blocked_fuses_regexes(tmp_path):
+    """Several regex entries are searched as one pattern, keeping per-entry flags."""
+    import json
+    from twitch_bot import TwitchBot
+
+    blacklist = tmp_path / "blacklist.json"
+    blacklist.write_text(json.dumps(["/bit\\.ly/", "/free (gift|coins)/i"]))
+
+    bot = TwitchBot(
+        bot_user_id="123",
+        oauth_token="token",
+        client_id="client",
+        channel_user_id="456",
+    )
+    with patch("twitch_bot._data_path", return_value=str(blacklist)):
+        bot.fetch_blocked_terms()
+
+    assert bot._fused_regex is not None
+    assert bot.is_message_blocked("see BIT.LY/x") == (False, None)
+    assert bot.is_message_blocked("see bit.ly/x") == (True, "bit\\.ly")
+    assert bot.is_message_blocked("FREE Coins here") == (True, "free (gift|coins)")
+    assert bot.is_message_blocked("free stuff") == (False, None)
+
+
+def test_fuse_regexes_skips_group_references():
+    """Patterns with backreferences are left unfused (group numbers would shift)."""
+    import re
+    from twitch_bot import _fuse_regexes
+
+    assert _fuse_regexes([re.compile(r"spam"), re.compile(r"(\w)\1{4}")]) is None
+    assert _fuse_regexes([re.compile(r"spam"), re.compile(r"(eggs)+")]) is not None
+
+
+def test_is_message_blocked_with_no_terms():
+    """An empty blacklist never blocks."""
+    from twitch_bot import TwitchBot
+
+    bot = TwitchBot(
+        bot_user_id="123",
+        oauth_token="token",
+        client_id="client",
+        channel_user_id="456",
+    )
+    assert bot.is_message_blocked("anything") == (False, None)
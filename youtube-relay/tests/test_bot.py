@@ -0,0 +1,324 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+
+CONFIG = {
+    "youtube_channel_url": "https://www.youtube.com/@TestChannel",
+    "twitch_bot_user_id": "123",
+    "twitch_oauth_token": "token",
+    "twitch_client_id": "client",
+    "twitch_channel_user_id": "456",
+    "twitch_channel_name": "testchannel",
+}
+
+
+def _make_bot():
+    from bot import YouTubeToTwitchBot
+
+    return YouTubeToTwitchBot(CONFIG)
+
+
+def test_wait_for_stream_start_wakes_on_status_write(tmp_path):
+    """wait_for_stream_start returns as soon as stream-status.json reports live."""
+    bot = _make_bot()
+    bot.running = True
+    status_path = tmp_path / "stream-status.json"
+    status_path.write_text(json.dumps({"testchannel": {"live": False}}))
+
+    def go_live():
+        time.sleep(0.3)
+        tmp = tmp_path / "stream-status.json.tmp"
+        tmp.write_text(json.dumps({"testchannel": {"live": True}}))
+        tmp.replace(status_path)
+
+    bot._status_path = str(status_path)
+    threading.Thread(target=go_live, daemon=True).start()
+    start = time.time()
+    assert bot.wait_for_stream_start() is True
+    assert time.time() - start < 5
+
+
+def test_wait_for_stream_start_stops_on_stop_event(tmp_path):
+    """wait_for_stream_start returns False once the bot is stopped."""
+    bot = _make_bot()
+    bot.running = True
+    status_path = tmp_path / "stream-status.json"
+
+    def stop():
+        time.sleep(0.3)
+        bot.running = False
+        bot._stop_event.set()
+
+    bot._status_path = str(status_path)
+    threading.Thread(target=stop, daemon=True).start()
+    assert bot.wait_for_stream_start() is False
+
+
+def test_rate_limit_blocks_after_max_messages():
+    """A user is rate limited after RATE_LIMIT_MAX_MESSAGES in the window."""
+    from bot import RATE_LIMIT_MAX_MESSAGES
+
+    bot = _make_bot()
+    for i in range(RATE_LIMIT_MAX_MESSAGES):
+        assert bot._check_spam("Alice", f"msg {i}", 1000.0) is None
+    assert bot._check_spam("Alice", "one more", 1000.0) == "rate_limited"
+    assert bot._check_spam("Bob", "hi", 1000.0) is None
+
+
+def test_rate_limit_expires_old_timestamps():
+    """Timestamps older than RATE_LIMIT_WINDOW no longer count."""
+    from bot import RATE_LIMIT_MAX_MESSAGES, RATE_LIMIT_WINDOW
+
+    bot = _make_bot()
+    now = 1000.0
+    for i in range(RATE_LIMIT_MAX_MESSAGES):
+        bot._check_spam("Alice", f"msg {i}", now)
+    assert bot._check_spam("Alice", "one more", now) == "rate_limited"
+
+    assert bot._check_spam("Alice", "later", now + RATE_LIMIT_WINDOW + 1) is None
+    assert len(bot._spam_state["Alice"].timestamps) == 1
+
+
+def test_duplicate_detects_same_message_from_same_user():
+    """The same message from the same user within the window is a duplicate."""
+    bot = _make_bot()
+    assert bot._check_spam("Alice", "hello", 1000.0) is None
+    assert bot._check_spam("Alice", "hello", 1001.0) == "duplicate"
+    assert bot._check_spam("Alice", "hello again", 1002.0) is None
+    assert bot._check_spam("Bob", "hello again", 1003.0) is None
+
+
+def test_cleanup_spam_state_drops_stale_authors():
+    """_cleanup_spam_state removes authors with no recent activity."""
+    from bot import RATE_LIMIT_WINDOW, DUPLICATE_WINDOW
+
+    bot = _make_bot()
+    now = 1000.0
+    later = now + max(RATE_LIMIT_WINDOW, DUPLICATE_WINDOW) + 1
+    bot._check_spam("Alice", "hello", now)
+    bot._check_spam("Bob", "hello", later)
+    bot._cleanup_spam_state(later)
+    assert "Alice" not in bot._spam_state
+    assert "Bob" in bot._spam_state
+
+
+def test_read_stream_status_skips_parse_when_unchanged(tmp_path):
+    """_read_stream_status reuses the cached result while the file is unchanged."""
+    bot = _make_bot()
+    status_path = tmp_path / "stream-status.json"
+    status_path.write_text(json.dumps({"testchannel": {"live": True}}))
+
+    bot._status_path = str(status_path)
+    assert bot._read_stream_status() is True
+    with patch("bot.json.load") as mock_load:
+        assert bot._read_stream_status() is True
+        mock_load.assert_not_called()
+
+    tmp = tmp_path / "stream-status.json.tmp"
+    tmp.write_text(json.dumps({"testchannel": {"live": False}}))
+    tmp.replace(status_path)
+    assert bot._read_stream_status() is False
+
+
+def test_compile_message_format_matches_str_format():
+    """Compiled message formats produce the same output as str.format."""
+    from bot import _compile_message_format
+
+    templates = [
+        "[YT] {author}: {message}",
+        "{message} (from {author})",
+        "{{YT}} {author}: {message} {{end}}",
+        "{author!r}: {message:>10}",
+        "no fields",
+        "{message}{message}",
+        "100% {author}: {message}",
+    ]
+    for template in templates:
+        fmt = _compile_message_format(template)
+        assert fmt("Alice", "hi") == template.format(author="Alice", message="hi")
+
+
+def test_token_bucket_allows_burst_then_paces():
+    """TokenBucket allows `capacity` immediate acquires, then asks callers to wait."""
+    from bot import TokenBucket
+
+    now = 1000.0
+    with patch("bot._now", return_value=now):
+        bucket = TokenBucket(capacity=3, refill_rate=1.0)
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.acquire() == 1.0
+        assert bucket.acquire() == 2.0
+
+    # Refill is capped at capacity
+    with patch("bot._now", return_value=now + 100):
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.acquire() > 0
+
+
+def test_token_bucket_wait_time_does_not_take_a_token():
+    """wait_time() reports the wait for the next token without reserving it."""
+    from bot import TokenBucket
+
+    with patch("bot._now", return_value=1000.0):
+        bucket = TokenBucket(capacity=1, refill_rate=1.0)
+        assert bucket.wait_time() == 0.0
+        assert bucket.acquire() == 0.0
+        assert bucket.wait_time() == 1.0
+        assert bucket.wait_time() == 1.0
+
+
+def test_spam_state_evicts_least_recently_seen_author():
+    """Spam state is capped at SPAM_STATE_MAX_AUTHORS, evicting the oldest author."""
+    bot = _make_bot()
+    with patch("bot.SPAM_STATE_MAX_AUTHORS", 3):
+        bot._check_spam("Alice", "a", 1000.0)
+        bot._check_spam("Bob", "b", 1001.0)
+        bot._check_spam("Carol", "c", 1002.0)
+        bot._check_spam("Alice", "a2", 1003.0)  # Alice is now most recent
+        bot._check_spam("Dave", "d", 1004.0)
+    assert list(bot._spam_state) == ["Carol", "Alice", "Dave"]
+
+
+def test_sender_loop_sends_queued_messages_in_order():
+    """_sender_loop sends messages in order and exits on the None sentinel."""
+    bot = _make_bot()
+    sent = []
+
+    def send(message):
+        sent.append(message)
+        if message == "first":
+            bot._send_queue.put(None)
+
+    bot.twitch.send_message = send
+    bot._send_queue.put("first")
+    bot._sender_loop()
+
+    assert sent == ["first"]
+
+
+def test_sender_loop_batches_waiting_messages():
+    """Out of send allowance, queued messages are joined into one send, up to the length limit."""
+    from bot import BATCH_SEPARATOR, TWITCH_MAX_MESSAGE_LENGTH
+
+    bot = _make_bot()
+    sent = []
+    bot.twitch.send_message = sent.append
+    bot._send_bucket._tokens = 0
+    bot._send_bucket.refill_rate = 100
+
+    long_message = "x" * (TWITCH_MAX_MESSAGE_LENGTH - 5)
+    for message in ("a", "b", long_message, "c"):
+        bot._send_queue.put(message)
+    bot._send_queue.put(None)
+    bot._sender_loop()
+
+    assert sent == [f"a{BATCH_SEPARATOR}b", f"{long_message}{BATCH_SEPARATOR}c"]
+
+
+def test_sender_loop_sends_separately_with_allowance():
+    """With send allowance left, queued messages are not batched."""
+    bot = _make_bot()
+    sent = []
+    bot.twitch.send_message = sent.append
+
+    for message in ("a", "b", "c"):
+        bot._send_queue.put(message)
+    bot._send_queue.put(None)
+    bot._sender_loop()
+
+    assert sent == ["a", "b", "c"]
+
+
+def test_status_watcher_flags_blacklist_changes(tmp_path):
+    """Editing blacklist.json sets _blacklist_changed and wakes the main loop."""
+    bot = _make_bot()
+    bot._status_path = str(tmp_path / "stream-status.json")
+    bot.twitch._blacklist_check_interval = 1800
+
+    thread = threading.Thread(target=bot._status_watch_loop, daemon=True)
+    thread.start()
+    try:
+        time.sleep(0.3)
+        (tmp_path / "blacklist.json").write_text(json.dumps(["spam"]))
+        assert bot._blacklist_changed.wait(5)
+        assert bot.youtube.queue.get(timeout=1) is None
+    finally:
+        bot._stop_event.set()
+        thread.join(timeout=5)
+
+
+def test_wait_for_stream_start_polls_when_watcher_fails(tmp_path):
+    """A failing file watcher falls back to polling instead of raising."""
+    bot = _make_bot()
+    bot.running = True
+    status_path = tmp_path / "stream-status.json"
+    status_path.write_text(json.dumps({"testchannel": {"live": False}}))
+    bot._status_path = str(status_path)
+
+    def go_live():
+        time.sleep(0.3)
+        tmp = tmp_path / "stream-status.json.tmp"
+        tmp.write_text(json.dumps({"testchannel": {"live": True}}))
+        tmp.replace(status_path)
+
+    threading.Thread(target=go_live, daemon=True).start()
+    with patch("bot.watch", side_effect=OSError("inotify watch limit reached")), \
+         patch("bot.STATUS_POLL_INTERVAL", 0.1):
+        assert bot.wait_for_stream_start() is True
+
+
+def test_status_watcher_keeps_status_current_when_watcher_fails(tmp_path):
+    """The status thread still tracks stream-status.json if watching fails."""
+    bot = _make_bot()
+    status_path = tmp_path / "stream-status.json"
+    status_path.write_text(json.dumps({"testchannel": {"live": True}}))
+    bot._status_path = str(status_path)
+
+    with patch("bot.watch", side_effect=OSError("inotify watch limit reached")), \
+         patch("bot.STATUS_POLL_INTERVAL", 0.1):
+        thread = threading.Thread(target=bot._status_watch_loop, daemon=True)
+        thread.start()
+        try:
+            assert bot._status_changed.wait(5)
+            assert bot._is_live is True
+        finally:
+            bot._stop_event.set()
+            thread.join(timeout=5)
+
+
+def test_status_watcher_reads_status_before_first_event(tmp_path):
+    """The status thread picks up an offline stream without waiting for a file event."""
+    bot = _make_bot()
+    status_path = tmp_path / "stream-status.json"
+    status_path.write_text(json.dumps({"testchannel": {"live": False}}))
+    bot._status_path = str(status_path)
+    bot._is_live = True
+
+    def idle_watch(*_args, stop_event, **_kwargs):
+        stop_event.wait()
+        yield from ()
+
+    with patch("bot.watch", side_effect=idle_watch):
+        thread = threading.Thread(target=bot._status_watch_loop, daemon=True)
+        thread.start()
+        try:
+            assert bot._status_changed.wait(5)
+            assert bot._is_live is False
+        finally:
+            bot._stop_event.set()
+            thread.join(timeout=5)
+
+
+def test_data_file_changes_polls_when_data_dir_missing(tmp_path):
+    """Without a data directory to watch, changes are polled every STATUS_POLL_INTERVAL."""
+    bot = _make_bot()
+    bot._status_path = str(tmp_path / "missing" / "stream-status.json")
+
+    with patch("bot.STATUS_POLL_INTERVAL", 0.05):
+        changes = bot._data_file_changes({"stream-status.json"})
+        start = time.time()
+        assert next(changes) == set()
+        assert time.time() - start < 5
+    bot._stop_event.set()
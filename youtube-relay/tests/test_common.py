@@ -0,0 +1,28 @@
+from unittest.mock import patch
+
+
+def test_log_formats_utc_timestamp(capsys):
+    """log() prefixes messages with an ISO-8601 UTC timestamp in milliseconds."""
+    from common import log
+
+    # 2024-01-02T03:04:05.678Z
+    with patch("common.time.time_ns", return_value=1704164645_678_901_234):
+        log("hello")
+    assert capsys.readouterr().out == "[2024-01-02T03:04:05.678Z] hello\n"
+
+
+def test_log_reuses_timestamp_within_second(capsys):
+    """log() keeps the per-second prefix correct across second boundaries."""
+    from common import log
+
+    with patch("common.time.time_ns", return_value=1704164645_100_000_000):
+        log("a")
+    with patch("common.time.time_ns", return_value=1704164645_900_000_000):
+        log("b")
+    with patch("common.time.time_ns", return_value=1704164646_000_000_000):
+        log("c")
+    assert capsys.readouterr().out == (
+        "[2024-01-02T03:04:05.100Z] a\n"
+        "[2024-01-02T03:04:05.900Z] b\n"
+        "[2024-01-02T03:04:06.000Z] c\n"
+    )
@@ -69,12 +69,34 @@ def test_reload_handles_missing_file():
         assert converter._mappings == {}
 
 
+def test_reload_skips_parse_when_file_unchanged(tmp_path):
+    """reload() keeps the current mappings while the file is unchanged."""
+    from emoji_converter import EmojiConverter
+
+    path = tmp_path / "emoji-mappings.json"
+    path.write_text(json.dumps({":test:": "TestVal"}))
+    converter = EmojiConverter(str(tmp_path))
+    converter.reload()
+    mappings = converter._mappings
+
+    with patch("emoji_converter.json.load") as mock_load:
+        converter.reload()
+        mock_load.assert_not_called()
+    assert converter._mappings is mappings
+
+    tmp = tmp_path / "emoji-mappings.json.tmp"
+    tmp.write_text(json.dumps({":test:": "NewVal"}))
+    tmp.replace(path)
+    converter.reload()
+    assert converter._mappings == {":test:": "NewVal"}
+
+
 def test_reload_if_needed_respects_interval():
     """reload_if_needed only reloads after interval elapsed."""
     from emoji_converter import EmojiConverter
 
     converter = EmojiConverter("/app/data", reload_interval=300)
-    converter._last_reload = time.time()  # Just loaded
+    converter._last_reload = time.monotonic()  # Just loaded
     converter._mappings = {":old:": "old"}
 
     with patch.object(converter, "reload") as mock_reload:
@@ -235,3 +257,41 @@ def test_collapse_space_between_text_and_emoji():
     msg = "Love Mom:yougotthis::yougotthis::thanksdoc::thanksdoc:"
     result = converter.collapse_emojis(msg)
     assert result == "Love Mom :yougotthis: x2 :thanksdoc: x2"
+
+
+def test_convert_picks_up_replaced_mappings():
+    """convert() uses the current mappings after they are replaced (e.g. by reload)."""
+    from emoji_converter import EmojiConverter
+
+    converter = EmojiConverter("/app/data")
+    converter._mappings = {":heart:": "<3"}
+    assert converter.convert("I :heart: it") == "I <3 it"
+
+    converter._mappings = {":heart:": "❤️", ":heartbeat:": "\U0001F493"}
+    assert converter.convert(":heart: :heartbeat:") == "❤️ \U0001F493"
+
+
+def test_convert_does_not_match_across_unmapped_shortcodes():
+    """A mapped name is not matched starting at an unmapped shortcode's closing colon."""
+    from emoji_converter import EmojiConverter
+
+    converter = EmojiConverter("/app/data")
+    converter._mappings = {":heart:": "<3"}
+    assert converter.convert("a:b:heart:") == "a:b:heart:"
+    assert converter.convert(":hello:heart:") == ":hello:heart:"
+    assert converter.convert(":hello::heart:") == ":hello:<3"
+
+
+def test_convert_caches_repeat_messages():
+    """Repeat messages hit the cache until the mappings are replaced."""
+    from emoji_converter import EmojiConverter
+
+    converter = EmojiConverter("/app/data")
+    converter._mappings = {":heart:": "<3"}
+    assert converter.convert("I :heart: it") == "I <3 it"
+    assert converter.convert("I :heart: it") == "I <3 it"
+    assert converter._convert_cached.cache_info().hits == 1
+
+    converter._mappings = {":heart:": "❤️"}
+    assert converter.convert("I :heart: it") == "I ❤️ it"
+    assert converter._convert_cached.cache_info().hits == 0
@@ -0,0 +1,260 @@
+from unittest.mock import patch, MagicMock
+
+
+def _make_bot():
+    from twitch_bot import TwitchBot
+
+    return TwitchBot(
+        bot_user_id="123",
+        oauth_token="token",
+        client_id="client",
+        channel_user_id="456",
+    )
+
+
+def test_send_message_uses_shared_session():
+    """send_message posts through the bot's keep-alive session with Client-Id set."""
+    bot = _make_bot()
+    response = MagicMock(status_code=200)
+
+    with patch.object(bot._http, "post", return_value=response) as mock_post:
+        bot.send_message("hello")
+
+    assert bot._http.headers["Client-Id"] == "client"
+    kwargs = mock_post.call_args.kwargs
+    assert kwargs["headers"] == {"Authorization": "Bearer token"}
+    assert kwargs["json"] == {"broadcaster_id": "456", "sender_id": "123", "message": "hello"}
+
+
+def test_send_message_retries_with_shared_token_on_401():
+    """A 401 reloads the shared token and retries once with it."""
+    bot = _make_bot()
+    unauthorized = MagicMock(status_code=401, text='{"error":"Unauthorized"}')
+    ok = MagicMock(status_code=200)
+
+    with patch.object(bot._http, "post", side_effect=[unauthorized, ok]) as mock_post, \
+         patch.object(bot, "_load_shared_tokens", return_value=("fresh", None)):
+        bot.send_message("hello")
+
+    assert mock_post.call_count == 2
+    assert mock_post.call_args.kwargs["headers"] == {"Authorization": "Bearer fresh"}
+
+
+def test_validate_token_trusts_result_until_expiry():
+    """A validated token is not re-validated until near its reported expiry."""
+    from twitch_bot import TOKEN_EXPIRY_MARGIN
+
+    bot = _make_bot()
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"expires_in": TOKEN_EXPIRY_MARGIN + 100}
+
+    with patch.object(bot._http, "get", return_value=response) as mock_get, \
+         patch("twitch_bot.time.monotonic", return_value=1000.0):
+        assert bot.validate_token() is True
+        assert bot.validate_token() is True
+        assert mock_get.call_count == 1
+
+        bot.oauth_token = "other"
+        assert bot.validate_token() is True
+        assert mock_get.call_count == 2
+
+    with patch.object(bot._http, "get", return_value=response) as mock_get, \
+         patch("twitch_bot.time.monotonic", return_value=1100.0):
+        assert bot.validate_token() is True
+        mock_get.assert_called_once()
+
+
+def test_session_retries_rate_limits_with_backoff():
+    """POSTs retry only 429/503; GETs also retry gateway errors."""
+    from twitch_bot import HELIX_CHAT_MESSAGES_URL, OAUTH_TOKEN_URL, OAUTH_VALIDATE_URL
+
+    bot = _make_bot()
+    for url in (HELIX_CHAT_MESSAGES_URL, OAUTH_TOKEN_URL):
+        retry = bot._http.get_adapter(url).max_retries
+        assert retry.is_retry("POST", 429, has_retry_after=True)
+        assert retry.is_retry("POST", 503)
+        for status in (500, 502, 504):
+            assert not retry.is_retry("POST", status)
+        assert retry.respect_retry_after_header
+        assert retry.backoff_factor > 0
+
+    retry = bot._http.get_adapter(OAUTH_VALIDATE_URL).max_retries
+    assert retry.is_retry("GET", 502)
+    assert retry.is_retry("GET", 504)
+    assert not retry.is_retry("POST", 429)
+
+
+def test_send_message_logs_non_json_error_body(capsys):
+    """A non-JSON error body (e.g. a gateway page) is logged, not parsed."""
+    bot = _make_bot()
+    response = MagicMock(status_code=502, text="<html>Bad Gateway</html>")
+    response.json.side_effect = ValueError("not JSON")
+
+    with patch.object(bot._http, "post", return_value=response):
+        bot.send_message("hello")
+
+    out = capsys.readouterr().out
+    assert "Failed to send message: 502" in out
+    assert "<html>Bad Gateway</html>" in out
+
+
+def test_persist_shared_tokens_replaces_file_atomically(tmp_path):
+    """Tokens are written via a temp file renamed over tokens.json."""
+    import json
+    import os
+
+    bot = _make_bot()
+    tokens_path = tmp_path / "tokens.json"
+    tokens_path.write_text(json.dumps({"accessToken": "old"}))
+
+    with patch("twitch_bot._data_path", return_value=str(tokens_path)), \
+         patch("twitch_bot.os.replace", wraps=os.replace) as mock_replace:
+        bot._persist_shared_tokens("new_access", "new_refresh")
+
+    mock_replace.assert_called_once_with(str(tokens_path) + ".tmp", str(tokens_path))
+    data = json.loads(tokens_path.read_text())
+    assert data["accessToken"] == "new_access"
+    assert data["refreshToken"] == "new_refresh"
+    assert not (tmp_path / "tokens.json.tmp").exists()
+
+
+def test_load_shared_tokens_reuses_parse_while_unchanged(tmp_path):
+    """tokens.json is only re-parsed after it changes."""
+    import json
+
+    bot = _make_bot()
+    tokens_path = tmp_path / "tokens.json"
+    tokens_path.write_text(json.dumps({"accessToken": "a1", "refreshToken": "r1"}))
+
+    with patch("twitch_bot._data_path", return_value=str(tokens_path)):
+        assert bot._load_shared_tokens() == ("a1", "r1")
+        with patch("twitch_bot.json.load") as mock_load:
+            assert bot._load_shared_tokens() == ("a1", "r1")
+            mock_load.assert_not_called()
+
+        bot._persist_shared_tokens("a2", "r2")
+        assert bot._load_shared_tokens() == ("a2", "r2")
+
+
+def test_send_message_pauses_after_repeated_failures():
+    """Consecutive failed sends open the breaker; a failed probe reopens it."""
+    import requests
+    from twitch_bot import SEND_FAILURE_THRESHOLD, SEND_PAUSE_SECONDS
+
+    bot = _make_bot()
+    error = requests.exceptions.ConnectionError("down")
+
+    with patch.object(bot._http, "post", side_effect=error) as mock_post, \
+         patch("twitch_bot.time.monotonic", return_value=1000.0):
+        for _ in range(SEND_FAILURE_THRESHOLD):
+            bot.send_message("hello")
+        assert mock_post.call_count == SEND_FAILURE_THRESHOLD
+
+        bot.send_message("dropped")
+        assert mock_post.call_count == SEND_FAILURE_THRESHOLD
+
+    later = 1000.0 + SEND_PAUSE_SECONDS
+    with patch.object(bot._http, "post", side_effect=error) as mock_post, \
+         patch("twitch_bot.time.monotonic", return_value=later):
+        bot.send_message("probe")
+        bot.send_message("dropped again")
+        assert mock_post.call_count == 1
+
+    ok = MagicMock(status_code=200)
+    with patch.object(bot._http, "post", return_value=ok) as mock_post, \
+         patch("twitch_bot.time.monotonic", return_value=later + SEND_PAUSE_SECONDS):
+        bot.send_message("recovered")
+        bot.send_message("and again")
+        assert mock_post.call_count == 2
+    assert bot._send_failures == 0
+
+
+def test_persist_shared_tokens_keeps_owner_and_mode(tmp_path):
+    """The replacement tokens.json keeps the original file's owner and mode."""
+    import json
+    import os
+
+    bot = _make_bot()
+    tokens_path = tmp_path / "tokens.json"
+    tokens_path.write_text(json.dumps({"accessToken": "old"}))
+    os.chmod(tokens_path, 0o640)
+    st = os.stat(tokens_path)
+
+    with patch("twitch_bot._data_path", return_value=str(tokens_path)), \
+         patch("twitch_bot.os.fchown", wraps=os.fchown) as mock_fchown:
+        bot._persist_shared_tokens("new_access", "new_refresh")
+
+    assert mock_fchown.call_args.args[1:] == (st.st_uid, st.st_gid)
+    assert os.stat(tokens_path).st_mode & 0o777 == 0o640
+    assert json.loads(tokens_path.read_text())["accessToken"] == "new_access"
+
+
+def test_persist_shared_tokens_writes_in_place_when_owner_cannot_be_kept(tmp_path):
+    """If the owner can't be kept, tokens.json is rewritten in place instead."""
+    import json
+    import os
+
+    bot = _make_bot()
+    tokens_path = tmp_path / "tokens.json"
+    tokens_path.write_text(json.dumps({"accessToken": "old"}))
+    inode = os.stat(tokens_path).st_ino
+
+    with patch("twitch_bot._data_path", return_value=str(tokens_path)), \
+         patch("twitch_bot.os.fchown", side_effect=PermissionError("not owner")), \
+         patch("twitch_bot.os.replace") as mock_replace:
+        bot._persist_shared_tokens("new_access", "new_refresh")
+
+    mock_replace.assert_not_called()
+    assert os.stat(tokens_path).st_ino == inode
+    assert json.loads(tokens_path.read_text())["accessToken"] == "new_access"
+    assert not (tmp_path / "tokens.json.tmp").exists()
+
+
+def test_persist_shared_tokens_without_fchown(tmp_path, monkeypatch):
+    """Platforms without os.fchown (Windows) still replace tokens.json atomically."""
+    import json
+    import os
+
+    bot = _make_bot()
+    tokens_path = tmp_path / "tokens.json"
+    tokens_path.write_text(json.dumps({"accessToken": "old"}))
+    monkeypatch.delattr(os, "fchown")
+    monkeypatch.delattr(os, "fchmod")
+
+    with patch("twitch_bot._data_path", return_value=str(tokens_path)), \
+         patch("twitch_bot.os.replace", wraps=os.replace) as mock_replace:
+        bot._persist_shared_tokens("new_access", "new_refresh")
+
+    mock_replace.assert_called_once_with(str(tokens_path) + ".tmp", str(tokens_path))
+    assert json.loads(tokens_path.read_text())["accessToken"] == "new_access"
+
+
+def test_disconnect_waits_for_in_flight_send():
+    """disconnect() on another thread doesn't close the session mid-send."""
+    import threading
+
+    bot = _make_bot()
+    sending = threading.Event()
+    release = threading.Event()
+
+    def slow_post(*_args, **_kwargs):
+        sending.set()
+        release.wait(5)
+        return MagicMock(status_code=200)
+
+    with patch.object(bot._http, "post", side_effect=slow_post), \
+         patch.object(bot._http, "close") as mock_close:
+        sender = threading.Thread(target=bot.send_message, args=("hello",))
+        sender.start()
+        assert sending.wait(5)
+
+        closer = threading.Thread(target=bot.disconnect)
+        closer.start()
+        closer.join(timeout=0.2)
+        assert closer.is_alive()
+        mock_close.assert_not_called()
+
+        release.set()
+        sender.join(timeout=5)
+        closer.join(timeout=5)
+        mock_close.assert_called_once()
@@ -84,7 +84,7 @@ def test_poll_chat_parses_text_messages():
     mock_resp.json.return_value = response_data
     mock_resp.raise_for_status = MagicMock()
 
-    with patch("youtube_reader.requests.post", return_value=mock_resp):
+    with patch.object(reader._session, "post", return_value=mock_resp):
         messages, cont, timeout = reader._poll_chat("token", "key")
 
     assert len(messages) == 2
@@ -132,7 +132,7 @@ def test_poll_chat_skips_non_text_messages():
     mock_resp.json.return_value = response_data
     mock_resp.raise_for_status = MagicMock()
 
-    with patch("youtube_reader.requests.post", return_value=mock_resp):
+    with patch.object(reader._session, "post", return_value=mock_resp):
         messages, _, _ = reader._poll_chat("token", "key")
 
     assert len(messages) == 1
@@ -170,12 +170,34 @@ def test_poll_chat_handles_emoji_runs():
     mock_resp.json.return_value = response_data
     mock_resp.raise_for_status = MagicMock()
 
-    with patch("youtube_reader.requests.post", return_value=mock_resp):
+    with patch.object(reader._session, "post", return_value=mock_resp):
         messages, _, _ = reader._poll_chat("token", "key")
 
     assert messages[0]["message"] == "hi :heart:"
 
 
+def test_poll_chat_reads_author_from_runs():
+    """_poll_chat falls back to authorName runs when simpleText is absent."""
+    from youtube_reader import YouTubeChatReader
+
+    reader = YouTubeChatReader("https://www.youtube.com/@TestChannel")
+
+    response_data = _make_innertube_response([("Alice", "Hello"), ("Bob", "Hi")])
+    actions = response_data["continuationContents"]["liveChatContinuation"]["actions"]
+    renderer = actions[0]["addChatItemAction"]["item"]["liveChatTextMessageRenderer"]
+    renderer["authorName"] = {"runs": [{"text": "Alice"}]}
+    del actions[1]["addChatItemAction"]["item"]["liveChatTextMessageRenderer"]["authorName"]
+
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = response_data
+    mock_resp.raise_for_status = MagicMock()
+
+    with patch.object(reader._session, "post", return_value=mock_resp):
+        messages, _, _ = reader._poll_chat("token", "key")
+
+    assert [m["author"] for m in messages] == ["Alice", "Unknown"]
+
+
 def test_reader_stop_sets_running_false():
     """Calling stop() sets running to False."""
     from youtube_reader import YouTubeChatReader
@@ -184,3 +206,54 @@ def test_reader_stop_sets_running_false():
     reader.running = True
     reader.stop()
     assert reader.running is False
+
+
+def test_reader_stop_interrupts_poll_wait():
+    """stop() wakes the reader thread out of the poll interval wait."""
+    from youtube_reader import YouTubeChatReader
+
+    reader = YouTubeChatReader("https://www.youtube.com/@TestChannel")
+
+    with patch.object(reader, "_find_live_video_id", return_value="test123"), \
+         patch.object(reader, "_get_initial_chat_data", return_value=("init_token", "key")), \
+         patch.object(reader, "_poll_chat", return_value=([], "next", 60000)):
+        reader.start()
+        time.sleep(0.2)
+        reader.stop()
+        reader._thread.join(timeout=2)
+
+    assert not reader._thread.is_alive()
+
+
+def test_read_loop_reuses_video_id_after_poll_error():
+    """A polling error retries the known stream; an ended chat looks it up again."""
+    import threading
+    from youtube_reader import YouTubeChatReader
+
+    reader = YouTubeChatReader("https://www.youtube.com/@TestChannel")
+    stop_event = threading.Event()
+    poll_results = [Exception("poll failed"), ([], None, 1000)]
+    initial_results = [("init_token", "key"), ("init_token", "key"), Exception("gone")]
+
+    def poll(continuation, api_key):
+        result = poll_results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def initial(video_id):
+        result = initial_results.pop(0)
+        if not initial_results:
+            stop_event.set()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with patch.object(reader, "_find_live_video_id", return_value="test123") as mock_find, \
+         patch.object(reader, "_get_initial_chat_data", side_effect=initial), \
+         patch.object(reader, "_poll_chat", side_effect=poll), \
+         patch.object(stop_event, "wait", return_value=False):
+        reader._read_loop(stop_event)
+
+    # Initial lookup, reuse after the poll error, fresh lookup after the chat ended
+    assert mock_find.call_count == 2
@@ -3,26 +3,124 @@
 import json
 import os
 import re
+import stat
+import threading
 import time
+import ahocorasick
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timezone
 from typing import Optional, List
 
-
-def _log(msg):
-    """Print with timestamp and immediate flush."""
-    now = datetime.now(timezone.utc)
-    ts = now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z"
-    print(f"[{ts}] {msg}", flush=True)
+from common import DATA_DIR, log
+
+
+# Twitch endpoints
+OAUTH_TOKEN_URL = "https://id.twitch.tv/oauth2/token"
+OAUTH_VALIDATE_URL = "https://id.twitch.tv/oauth2/validate"
+HELIX_CHAT_MESSAGES_URL = "https://api.twitch.tv/helix/chat/messages"
+
+# Blocked terms file in the shared data directory
+BLACKLIST_FILENAME = "blacklist.json"
+
+# Re-validate this many seconds before the token's reported expiry
+TOKEN_EXPIRY_MARGIN = 300
+
+# Circuit breaker: after this many consecutive failed sends (network errors,
+# 429/5xx after the session's own retries), drop sends for a while instead of
+# waiting out a timeout per message; the first send after the pause is the
+# probe, and a failed probe pauses again
+SEND_FAILURE_THRESHOLD = 5
+SEND_PAUSE_SECONDS = 30
+
+
+# Transient failures retried by the HTTP session (exponential backoff,
+# honouring Retry-After). GETs also retry gateway errors. POSTs (chat sends,
+# token refresh) only retry 429/503, where Twitch rejected the request
+# outright: after a 500/502/504 the message may already be posted or the
+# refresh token rotated, and a retry would duplicate or replay it.
+_GET_RETRY = Retry(
+    total=3,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset(("GET",)),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+_POST_RETRY = Retry(
+    total=3,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=(429, 503),
+    allowed_methods=frozenset(("POST",)),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
 
 
 def _data_path(filename):
-    """Resolve a file path in the data directory (works locally and in Docker)."""
-    # ../data for local dev (youtube-relay/../data/), ./data for Docker (/app/data/)
-    path = os.path.join(os.path.dirname(__file__), "..", "data", filename)
-    if os.path.exists(path):
-        return path
-    return os.path.join(os.path.dirname(__file__), "data", filename)
+    """Path of a file in the shared data directory (resolved once at import)."""
+    return os.path.join(DATA_DIR, filename)
+
+
+def _file_stamp(path):
+    """Return (st_ino, st_mtime_ns) for a file, or None if it can't be stat'ed.
+
+    One stat call; a replaced file (new inode) or a write within the same
+    coarse mtime tick still changes the stamp.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def _build_terms_automaton(terms):
+    """Compile lowercase text terms into an Aho-Corasick automaton (None if empty).
+
+    Matching a message is then a single pass regardless of how many
+    terms are on the blacklist.
+    """
+    if not terms:
+        return None
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+
+# Backreferences and group conditionals rely on group numbering, which
+# changes once patterns are fused into one
+_GROUP_REFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+def _fuse_regexes(regexes):
+    """Combine blacklist regexes into one alternation (None if not possible).
+
+    Each pattern becomes a named group, so a single search scans the
+    message once and `match.lastgroup` says which pattern hit. Per-pattern
+    IGNORECASE survives as a scoped (?i:...) group. Patterns that depend on
+    group numbering, or that don't compile together (duplicate group names,
+    global inline flags), leave the list unfused.
+    """
+    if len(regexes) < 2:
+        return None
+    parts = []
+    for i, regex in enumerate(regexes):
+        pattern = regex.pattern
+        if regex.groups and _GROUP_REFERENCE_RE.search(pattern):
+            return None
+        if regex.flags & re.IGNORECASE:
+            pattern = f"(?i:{pattern})"
+        parts.append(f"(?P<_blk{i}>{pattern})")
+    try:
+        return re.compile("|".join(parts))
+    except re.error:
+        return None
 
 
 class TwitchBot:
@@ -48,40 +146,101 @@ class TwitchBot:
         self.broadcaster_refresh_token = broadcaster_refresh_token
         self.channel_user_id = channel_user_id
         self.blocked_terms = []
+        self._terms_automaton = None
         self._blocked_regexes = []
+        self._fused_regex = None
         self._last_blacklist_check = 0
         self._blacklist_check_interval = 0
-        self._blacklist_mtime = 0
+        self._blacklist_stamp = None  # (st_ino, st_mtime_ns) of blacklist.json
+        self._tokens_cache = (None, (None, None))  # (file stamp, tokens)
+        self._bearer = (None, None)  # (token, Helix Authorization headers)
+        self._send_failures = 0
+        self._send_paused_until = 0.0  # monotonic
+        # Token last confirmed by /oauth2/validate, and until when (monotonic)
+        self._validated_token = None
+        self._validated_until = 0.0
+        # Sends run on the relay's sender thread while connect()/disconnect()
+        # run on the main thread; both touch the session and the token
+        self._lock = threading.RLock()
+
+        # One keep-alive session for all Twitch calls, so each send reuses
+        # the TLS connection instead of opening a new one; transient errors
+        # are retried with backoff by the adapters (see _GET_RETRY/_POST_RETRY)
+        self._http = requests.Session()
+        self._http.headers["Client-Id"] = client_id
+        self._http.mount("https://", HTTPAdapter(max_retries=_GET_RETRY))
+        for url in (OAUTH_TOKEN_URL, HELIX_CHAT_MESSAGES_URL):
+            self._http.mount(url, HTTPAdapter(max_retries=_POST_RETRY))
 
     # ── Shared token file ──────────────────────────────────────────
 
     def _load_shared_tokens(self):
-        """Load tokens from shared data/tokens.json (written by main bot)."""
+        """Load tokens from shared data/tokens.json (written by main bot).
+
+        The parsed result is reused while the file's stamp is unchanged, so
+        a burst of 401s doesn't re-read the same file for every send.
+        """
         tokens_path = _data_path("tokens.json")
+        stamp = _file_stamp(tokens_path)
+        if stamp is not None and stamp == self._tokens_cache[0]:
+            return self._tokens_cache[1]
+
         try:
             with open(tokens_path, "r", encoding="utf-8") as f:
+                st = os.fstat(f.fileno())
                 data = json.load(f)
-            access = data.get("accessToken")
-            refresh = data.get("refreshToken")
-            if access:
-                return access, refresh
         except (FileNotFoundError, json.JSONDecodeError, OSError):
-            pass
-        return None, None
+            return None, None
+
+        access = data.get("accessToken")
+        refresh = data.get("refreshToken")
+        tokens = (access, refresh) if access else (None, None)
+        self._tokens_cache = ((st.st_ino, st.st_mtime_ns), tokens)
+        return tokens
 
     def _persist_shared_tokens(self, access_token, refresh_token):
-        """Write tokens to shared data/tokens.json for other services."""
+        """Write tokens to shared data/tokens.json for other services.
+
+        Written to a temp file and renamed into place, so concurrent
+        readers see either the old or the new file, never a partial one.
+        The temp file takes the existing file's owner and mode first: the
+        main bot runs under a different uid and rewrites this file in
+        place, so a replacement owned by this process would lock it out.
+        If the owner can't be kept, the file is updated in place instead.
+        """
         tokens_path = _data_path("tokens.json")
+        tmp_path = tokens_path + ".tmp"
         try:
             data = {
                 "accessToken": access_token,
                 "refreshToken": refresh_token,
                 "updatedAt": datetime.now(timezone.utc).isoformat(),
             }
-            with open(tokens_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            try:
+                st = os.stat(tokens_path)
+            except FileNotFoundError:
+                st = None
+
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2)
+                    f.flush()
+                    # No fchown/fchmod on Windows, where ownership doesn't apply
+                    if st is not None and hasattr(os, "fchown"):
+                        os.fchown(f.fileno(), st.st_uid, st.st_gid)
+                        os.fchmod(f.fileno(), stat.S_IMODE(st.st_mode))
+                    os.fsync(f.fileno())
+            except PermissionError:
+                # Can't keep the owner (or create the temp file here)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                with open(tokens_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2)
+                return
+
+            os.replace(tmp_path, tokens_path)
         except OSError as e:
-            _log(f"Could not persist tokens: {e}")
+            log(f"Could not persist tokens: {e}")
 
     # ── Token management ──────────────────────────────────────────
 
@@ -91,8 +250,8 @@ class TwitchBot:
             return None
 
         try:
-            response = requests.post(
-                "https://id.twitch.tv/oauth2/token",
+            response = self._http.post(
+                OAUTH_TOKEN_URL,
                 data={
                     "client_id": self.client_id,
                     "client_secret": self.client_secret,
@@ -103,25 +262,25 @@ class TwitchBot:
             )
 
             if response.status_code != 200:
-                _log(f"Token refresh failed: {response.status_code}")
+                log(f"Token refresh failed: {response.status_code}")
                 return None
 
             data = response.json()
             new_access = data["access_token"]
             new_refresh = data["refresh_token"]
-            _log("Successfully refreshed OAuth token")
+            log("Successfully refreshed OAuth token")
             self._persist_shared_tokens(new_access, new_refresh)
             return (new_access, new_refresh)
 
         except requests.exceptions.RequestException as e:
-            _log(f"Token refresh error: {e}")
+            log(f"Token refresh error: {e}")
             return None
 
     def _reload_token_from_shared(self):
         """Try to reload a fresh token from tokens.json. Returns True if updated."""
         access, refresh = self._load_shared_tokens()
         if access and access != self.oauth_token:
-            _log("Loaded updated token from shared tokens.json")
+            log("Loaded updated token from shared tokens.json")
             self.oauth_token = access
             if refresh:
                 self.bot_refresh_token = refresh
@@ -129,10 +288,20 @@ class TwitchBot:
         return False
 
     def validate_token(self):
-        """Validate bot token, refresh if expired. Returns True if valid."""
+        """Validate bot token, refresh if expired. Returns True if valid.
+
+        A successful validation is trusted until shortly before the token's
+        reported expiry, so reconnects don't re-validate the same token.
+        """
+        if (
+            self.oauth_token == self._validated_token
+            and time.monotonic() < self._validated_until
+        ):
+            return True
+
         try:
-            response = requests.get(
-                "https://id.twitch.tv/oauth2/validate",
+            response = self._http.get(
+                OAUTH_VALIDATE_URL,
                 headers={"Authorization": f"OAuth {self.oauth_token}"},
                 timeout=5,
             )
@@ -143,111 +312,146 @@ class TwitchBot:
                     return self.validate_token()
                 # Fall back to own refresh
                 if self.bot_refresh_token:
-                    _log("Bot token expired, attempting refresh...")
+                    log("Bot token expired, attempting refresh...")
                     result = self.refresh_access_token(self.bot_refresh_token)
                     if result:
                         self.oauth_token, self.bot_refresh_token = result
                         return True
-                _log("Failed to refresh bot token")
+                log("Failed to refresh bot token")
                 return False
 
             if response.status_code != 200:
-                _log(f"Token validation failed: {response.status_code}")
+                log(f"Token validation failed: {response.status_code}")
                 return False
 
+            expires_in = response.json().get("expires_in")
+            if expires_in:
+                self._validated_token = self.oauth_token
+                self._validated_until = (
+                    time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN
+                )
             return True
 
         except requests.exceptions.RequestException as e:
-            _log(f"Token validation error: {e}")
+            log(f"Token validation error: {e}")
             return False
 
     # ── Connect / disconnect ──────────────────────────────────────
 
     def connect(self):
         """Load shared tokens, validate, and fetch blocked terms."""
-        # Try to use token from shared tokens.json (written by main bot)
-        access, refresh = self._load_shared_tokens()
-        if access:
-            _log("Using access token from shared tokens.json")
-            self.oauth_token = access
-            if refresh:
-                self.bot_refresh_token = refresh
+        with self._lock:
+            # Try to use token from shared tokens.json (written by main bot)
+            access, refresh = self._load_shared_tokens()
+            if access:
+                log("Using access token from shared tokens.json")
+                self.oauth_token = access
+                if refresh:
+                    self.bot_refresh_token = refresh
 
-        if not self.validate_token():
-            raise Exception("Bot OAuth token validation failed")
+            if not self.validate_token():
+                raise Exception("Bot OAuth token validation failed")
 
-        # Sync broadcaster token to bot token
-        self.broadcaster_oauth_token = self.oauth_token
+            # Sync broadcaster token to bot token
+            self.broadcaster_oauth_token = self.oauth_token
 
-        # Fetch blocked terms
-        self.fetch_blocked_terms()
-        self._last_blacklist_check = time.time()
+            # Fetch blocked terms
+            self.fetch_blocked_terms()
+            self._last_blacklist_check = time.time()
 
-        _log("Twitch API client ready")
+            log("Twitch API client ready")
 
     def disconnect(self):
-        """No-op (no persistent connection to close)."""
-        pass
+        """Close pooled HTTP connections (reopened on the next request)."""
+        with self._lock:
+            self._http.close()
 
     # ── Messaging ─────────────────────────────────────────────────
 
-    def send_message(self, message):
-        """Send a message to the Twitch channel via Helix API."""
-        try:
-            response = requests.post(
-                "https://api.twitch.tv/helix/chat/messages",
-                headers={
-                    "Authorization": f"Bearer {self.oauth_token}",
-                    "Client-Id": self.client_id,
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "broadcaster_id": self.channel_user_id,
-                    "sender_id": self.bot_user_id,
-                    "message": message,
-                },
-                timeout=5,
+    def _bearer_headers(self):
+        """Helix Authorization header, rebuilt only when the token changes."""
+        token, headers = self._bearer
+        if token != self.oauth_token:
+            token = self.oauth_token
+            headers = {"Authorization": f"Bearer {token}"}
+            self._bearer = (token, headers)
+        return headers
+
+    def _post_chat_message(self, message):
+        """POST one chat message to Helix. Returns the response."""
+        return self._http.post(
+            HELIX_CHAT_MESSAGES_URL,
+            headers=self._bearer_headers(),
+            json={
+                "broadcaster_id": self.channel_user_id,
+                "sender_id": self.bot_user_id,
+                "message": message,
+            },
+            timeout=5,
+        )
+
+    def _track_send_health(self, status_code):
+        """Count consecutive failed sends; open the circuit breaker at the threshold.
+
+        status_code is None for a network error. Any other 4xx means Twitch
+        answered, so it resets the count like a success.
+        """
+        if status_code is not None and status_code < 500 and status_code != 429:
+            self._send_failures = 0
+            return
+        self._send_failures += 1
+        if self._send_failures >= SEND_FAILURE_THRESHOLD:
+            self._send_paused_until = time.monotonic() + SEND_PAUSE_SECONDS
+            log(
+                f"Twitch API failing ({self._send_failures} sends in a row), "
+                f"pausing sends for {SEND_PAUSE_SECONDS}s"
             )
 
-            if response.status_code != 200:
-                _log(f"Failed to send message: {response.status_code}")
-                error = response.json()
-                _log(f"  {error}")
-
-                if response.status_code == 401:
-                    # Try reloading from shared tokens.json first
-                    if self._reload_token_from_shared():
-                        _log("Retrying with shared token...")
-                    elif self.bot_refresh_token:
-                        _log("Refreshing token and retrying...")
-                        result = self.refresh_access_token(self.bot_refresh_token)
-                        if not result:
+    def send_message(self, message):
+        """Send a message to the Twitch channel via Helix API.
+
+        While the circuit breaker is open (Twitch unreachable), messages
+        are dropped immediately rather than each waiting out a timeout.
+        """
+        with self._lock:
+            if time.monotonic() < self._send_paused_until:
+                log(f"[DROPPED] Twitch sends paused: {message}")
+                return
+
+            try:
+                response = self._post_chat_message(message)
+                self._track_send_health(response.status_code)
+
+                if response.status_code != 200:
+                    log(f"Failed to send message: {response.status_code}")
+                    # Log the raw body: gateway errors aren't JSON, and parsing
+                    # them would raise before the 401 handling below
+                    log(f"  {response.text[:500]}")
+
+                    if response.status_code == 401:
+                        # The token was revoked or expired early
+                        self._validated_token = None
+                        # Try reloading from shared tokens.json first
+                        if self._reload_token_from_shared():
+                            log("Retrying with shared token...")
+                        elif self.bot_refresh_token:
+                            log("Refreshing token and retrying...")
+                            result = self.refresh_access_token(self.bot_refresh_token)
+                            if not result:
+                                return
+                            self.oauth_token, self.bot_refresh_token = result
+                        else:
                             return
-                        self.oauth_token, self.bot_refresh_token = result
-                    else:
-                        return
-
-                    # Retry once with updated token
-                    retry = requests.post(
-                        "https://api.twitch.tv/helix/chat/messages",
-                        headers={
-                            "Authorization": f"Bearer {self.oauth_token}",
-                            "Client-Id": self.client_id,
-                            "Content-Type": "application/json",
-                        },
-                        json={
-                            "broadcaster_id": self.channel_user_id,
-                            "sender_id": self.bot_user_id,
-                            "message": message,
-                        },
-                        timeout=5,
-                    )
-                    if retry.status_code == 200:
-                        return
-                    _log(f"Retry failed: {retry.status_code}")
 
-        except requests.exceptions.RequestException as e:
-            _log(f"Error sending message: {e}")
+                        # Retry once with updated token
+                        retry = self._post_chat_message(message)
+                        if retry.status_code == 200:
+                            return
+                        log(f"Retry failed: {retry.status_code}")
+
+            except requests.exceptions.RequestException as e:
+                log(f"Error sending message: {e}")
+                self._track_send_health(None)
 
     # ── Blocked terms ─────────────────────────────────────────────
 
@@ -257,23 +461,25 @@ class TwitchBot:
         Entries starting with '/' are parsed as regex (/pattern/flags),
         everything else is plain text (case-insensitive substring match).
         """
-        blacklist_path = _data_path("blacklist.json")
-
-        try:
-            self._blacklist_mtime = os.path.getmtime(blacklist_path)
-        except OSError:
-            pass
+        blacklist_path = _data_path(BLACKLIST_FILENAME)
 
         try:
             with open(blacklist_path, "r", encoding="utf-8") as f:
+                # Stamp the file actually read (fstat on the open handle), so
+                # a replace between stat and read can't pair old contents
+                # with the new file's stamp
+                st = os.fstat(f.fileno())
+                self._blacklist_stamp = (st.st_ino, st.st_mtime_ns)
                 entries = json.load(f)
         except FileNotFoundError:
-            _log("No blacklist.json found, no terms loaded")
+            log("No blacklist.json found, no terms loaded")
             self.blocked_terms = []
+            self._terms_automaton = None
             self._blocked_regexes = []
+            self._fused_regex = None
             return
         except (json.JSONDecodeError, OSError) as e:
-            _log(f"Error reading blacklist.json: {e}")
+            log(f"Error reading blacklist.json: {e}")
             return
 
         if not isinstance(entries, list):
@@ -298,25 +504,32 @@ class TwitchBot:
                 try:
                     regexes.append(re.compile(pattern, flags))
                 except re.error as e:
-                    _log(f"Invalid blacklist regex \"{entry}\": {e}")
+                    log(f"Invalid blacklist regex \"{entry}\": {e}")
             else:
                 terms.append(entry.lower())
 
         self.blocked_terms = terms
+        self._terms_automaton = _build_terms_automaton(terms)
         self._blocked_regexes = regexes
+        self._fused_regex = _fuse_regexes(regexes)
         total = len(terms) + len(regexes)
-        _log(f"Loaded {total} blacklist entries ({len(terms)} text, {len(regexes)} regex)")
+        log(f"Loaded {total} blacklist entries ({len(terms)} text, {len(regexes)} regex)")
 
     def is_message_blocked(self, message):
         """Check if a message contains blocked terms. Returns (is_blocked, matched_term)."""
         if not self.blocked_terms and not self._blocked_regexes:
             return False, None
 
-        message_lower = message.lower()
-        for term in self.blocked_terms:
-            if term in message_lower:
+        if self._terms_automaton is not None:
+            for _, term in self._terms_automaton.iter(message.lower()):
                 return True, term
 
+        if self._fused_regex is not None:
+            match = self._fused_regex.search(message)
+            if match:
+                return True, self._blocked_regexes[int(match.lastgroup[4:])].pattern
+            return False, None
+
         for regex in self._blocked_regexes:
             if regex.search(message):
                 return True, regex.pattern
@@ -333,16 +546,21 @@ class TwitchBot:
             return
 
         self._last_blacklist_check = time.time()
-        blacklist_path = _data_path("blacklist.json")
+        self.reload_blocked_terms_if_changed()
 
-        try:
-            mtime = os.path.getmtime(blacklist_path)
-        except OSError:
+    def reload_blocked_terms_if_changed(self):
+        """Re-load blacklist from file if it changed since the last load.
+
+        Called directly when a file watcher reports a change, and by
+        refresh_blocked_terms_if_needed() as the timed fallback.
+        """
+        stamp = _file_stamp(_data_path(BLACKLIST_FILENAME))
+        if stamp is None:
             return
 
-        if mtime != self._blacklist_mtime:
+        if stamp != self._blacklist_stamp:
             old_count = len(self.blocked_terms) + len(self._blocked_regexes)
             self.fetch_blocked_terms()
             new_count = len(self.blocked_terms) + len(self._blocked_regexes)
             if new_count != old_count:
-                _log(f"Blacklist updated: {old_count} -> {new_count} entries")
+                log(f"Blacklist updated: {old_count} -> {new_count} entries")
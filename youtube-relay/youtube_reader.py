@@ -3,11 +3,11 @@
 import json
 import queue
 import re
-import time
 import threading
 import requests
 import yt_dlp
-from datetime import datetime, timezone
+
+from common import log
 
 
 # YouTube innertube (public, no auth required)
@@ -18,11 +18,11 @@ _INNERTUBE_CONTEXT = {
     }
 }
 
-
-def _log(msg):
-    now = datetime.now(timezone.utc)
-    ts = now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z"
-    print(f"[{ts}] {msg}", flush=True)
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
 
 
 class YouTubeChatReader:
@@ -34,9 +34,16 @@ class YouTubeChatReader:
 
     def __init__(self, channel_url):
         self.channel_url = channel_url
-        self.queue = queue.Queue()
+        # SimpleQueue: unbounded, implemented in C, no task tracking; the
+        # relay loop only needs put/get(timeout), so it skips Queue's
+        # Condition bookkeeping on every message
+        self.queue = queue.SimpleQueue()
         self.running = False
         self._thread = None
+        self._stop_event = threading.Event()
+        # One keep-alive session so each poll reuses the TLS connection
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = _USER_AGENT
 
     def start(self):
         """Start the background chat reader thread."""
@@ -44,18 +51,24 @@ class YouTubeChatReader:
             self.stop()
             self._thread.join(timeout=10)
         self.running = True
+        # Fresh event per thread: a previous reader that outlived the join
+        # above still sees its own (set) event and exits
+        self._stop_event = threading.Event()
         # Clear the queue so stale messages from before offline aren't relayed
-        while not self.queue.empty():
+        while True:
             try:
                 self.queue.get_nowait()
-            except Exception:
+            except queue.Empty:
                 break
-        self._thread = threading.Thread(target=self._read_loop, daemon=True)
+        self._thread = threading.Thread(
+            target=self._read_loop, args=(self._stop_event,), daemon=True
+        )
         self._thread.start()
 
     def stop(self):
         """Signal the reader thread to stop."""
         self.running = False
+        self._stop_event.set()
 
     def _find_live_video_id(self):
         """Use yt-dlp to find the active live stream video ID."""
@@ -82,15 +95,8 @@ class YouTubeChatReader:
 
     def _get_initial_chat_data(self, video_id):
         """Fetch the live chat page and extract continuation + API key."""
-        resp = requests.get(
+        resp = self._session.get(
             f"https://www.youtube.com/live_chat?v={video_id}",
-            headers={
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-            },
             cookies={"CONSENT": "YES+cb"},
             timeout=10,
         )
@@ -146,20 +152,12 @@ class YouTubeChatReader:
         if api_key:
             url += f"?key={api_key}"
 
-        resp = requests.post(
+        resp = self._session.post(
             url,
             json={
                 "context": _INNERTUBE_CONTEXT,
                 "continuation": continuation,
             },
-            headers={
-                "Content-Type": "application/json",
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-            },
             timeout=10,
         )
         resp.raise_for_status()
@@ -182,13 +180,25 @@ class YouTubeChatReader:
                 break
 
         # Extract chat messages
-        for action in live_chat.get("actions", []):
-            item = action.get("addChatItemAction", {}).get("item", {})
+        for action in live_chat.get("actions", ()):
+            # Deletions, tickers, paid and membership items are common too;
+            # reject them with plain lookups (no {} defaults, no exceptions)
+            add_item = action.get("addChatItemAction")
+            if add_item is None:
+                continue
+            item = add_item.get("item")
+            if item is None:
+                continue
             renderer = item.get("liveChatTextMessageRenderer")
-            if not renderer:
+            if renderer is None:
                 continue
 
-            author = renderer.get("authorName", {}).get("simpleText", "Unknown")
+            author_name = renderer.get("authorName") or {}
+            author = author_name.get("simpleText")
+            if author is None:
+                # Names occasionally arrive as runs instead of simpleText
+                name_runs = author_name.get("runs")
+                author = name_runs[0].get("text", "Unknown") if name_runs else "Unknown"
 
             # Build message text from runs
             runs = renderer.get("message", {}).get("runs", [])
@@ -217,29 +227,43 @@ class YouTubeChatReader:
 
         return messages, new_continuation, timeout_ms
 
-    def _read_loop(self):
-        """Background loop: find stream, connect to chat, poll for messages."""
+    def _read_loop(self, stop_event):
+        """Background loop: find stream, connect to chat, poll for messages.
+
+        Waits (poll interval, retry backoff) block on stop_event, so stop()
+        takes effect immediately instead of at the next sleep tick.
+
+        After a polling error on a connected chat, the retry reuses the
+        known video ID instead of running the (slow) yt-dlp lookup again;
+        if reconnecting to it fails, the next attempt looks it up afresh.
+        """
         backoff = 5
         max_backoff = 300
+        video_id = None
 
-        while self.running:
+        while not stop_event.is_set():
+            connected = False
             try:
-                _log(f"Finding live stream: {self.channel_url}")
-                video_id = self._find_live_video_id()
+                if video_id:
+                    log(f"Reconnecting to live stream: {video_id}")
+                else:
+                    log(f"Finding live stream: {self.channel_url}")
+                    video_id = self._find_live_video_id()
 
-                if not video_id:
-                    raise Exception("No active live stream found")
+                    if not video_id:
+                        raise Exception("No active live stream found")
 
-                _log(f"Found live stream: {video_id}")
+                    log(f"Found live stream: {video_id}")
 
                 # Get initial continuation token
                 continuation, api_key = self._get_initial_chat_data(video_id)
-                _log("Connected to YouTube live chat")
+                connected = True
+                log("Connected to YouTube live chat")
 
                 backoff = 5
 
                 # Poll loop
-                while self.running and continuation:
+                while continuation and not stop_event.is_set():
                     messages, new_continuation, timeout_ms = self._poll_chat(
                         continuation, api_key
                     )
@@ -248,27 +272,29 @@ class YouTubeChatReader:
                         self.queue.put(msg)
 
                     if not new_continuation:
-                        _log("Chat stream ended (no continuation)")
+                        log("Chat stream ended (no continuation)")
+                        connected = False
                         break
 
                     continuation = new_continuation
 
                     # Respect YouTube's suggested poll interval
-                    sleep_time = max(timeout_ms / 1000, 1.0)
-                    end_time = time.time() + sleep_time
-                    while self.running and time.time() < end_time:
-                        time.sleep(0.5)
+                    if stop_event.wait(max(timeout_ms / 1000, 1.0)):
+                        break
 
-                if self.running:
-                    _log("YouTube chat ended. Reconnecting...")
+                if not stop_event.is_set():
+                    log("YouTube chat ended. Reconnecting...")
 
             except Exception as e:
-                if not self.running:
+                if stop_event.is_set():
                     break
-                _log(f"YouTube chat error: {e}")
+                log(f"YouTube chat error: {e}")
+
+            if not connected:
+                video_id = None
 
             # Backoff before retry
-            if self.running:
-                _log(f"Retrying in {backoff}s...")
-                time.sleep(backoff)
+            if not stop_event.is_set():
+                log(f"Retrying in {backoff}s...")
+                stop_event.wait(backoff)
                 backoff = min(backoff * 2, max_backoff)